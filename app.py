@@ -6,7 +6,11 @@ import numpy as np
 import os
 from PIL import Image
 import matplotlib.pyplot as plt
-from pages import this_year, last_two_years, last_three_years
+from pages import this_year, last_two_years, last_three_years, year_window
+from dataset import get_dataset, get_batch_dataset, BATCH_REPORT_KEY
+from batch import resolve_batch_dir, BATCH_ROOT
+from precompute import precompute
+from layout import show_precompute_progress
 
 # Set page configuration
 st.set_page_config(
@@ -56,19 +60,58 @@ st.sidebar.markdown('<div class="sub-header">Budget Visualization</div>', unsafe
 # Navigation
 st.sidebar.markdown("## Navigation")
 page = st.sidebar.radio("Select a View:", 
-                        ["Home", "This Year", "Last 2 Years", "Last 3 Years"])
+                        ["Home", "This Year", "Last 2 Years", "Last 3 Years", "Multi-Year Comparison"])
 
 # File uploader in sidebar
 st.sidebar.markdown("## Upload Budget Data")
 uploaded_file = st.sidebar.file_uploader("Upload CSV or Excel file:", 
                                           type=["csv", "xlsx"])
 
+# Batch import: a zip archive or a server-side directory of budget files
+with st.sidebar.expander("Batch Import"):
+    batch_zip = st.file_uploader("Upload a zip of CSV/Excel files:", type=["zip"])
+    # Server directories only under the configured root, never arbitrary paths
+    batch_dir = st.text_input(f"Or a directory under {BATCH_ROOT}:") if BATCH_ROOT else ""
+
 # Sample data option
 if st.sidebar.checkbox("Use Sample Data", value=True):
     sample_data = True
 else:
     sample_data = False
 
+# Build the dataset once per session and upload; every view is handed the same object.
+# Large uploads report their ingestion progress in the sidebar.
+if uploaded_file is not None:
+    upload_progress = st.sidebar.progress(0.0, text="Processing upload...")
+    dataset = get_dataset(uploaded_file, sample_data, st.session_state, progress=upload_progress.progress)
+    upload_progress.empty()
+elif batch_zip is not None or batch_dir:
+    batch_progress = st.sidebar.progress(0.0, text="Importing files...")
+    try:
+        batch_source = batch_zip if batch_zip is not None else resolve_batch_dir(batch_dir)
+        dataset = get_batch_dataset(batch_source, st.session_state, progress=batch_progress.progress)
+    except (OSError, ValueError) as e:
+        st.sidebar.error(f"Could not read the batch: {e}")
+        dataset = get_dataset(None, sample_data, st.session_state)
+    batch_progress.empty()
+    
+    # Per-file validation results of the import
+    report = st.session_state.get(BATCH_REPORT_KEY, [])
+    rejected = [(name, errors) for name, errors in report if errors]
+    st.sidebar.caption(f"Merged {len(report) - len(rejected)} of {len(report)} files.")
+    if rejected:
+        with st.sidebar.expander(f"{len(rejected)} files skipped"):
+            for name, errors in rejected:
+                st.markdown(f"- **{name}** {'; '.join(errors)}")
+    if dataset is None:
+        dataset = get_dataset(None, sample_data, st.session_state)
+else:
+    dataset = get_dataset(uploaded_file, sample_data, st.session_state)
+
+# Precompute every view's derived tables in a background thread; views use them once ready
+if dataset is not None:
+    show_precompute_progress(precompute(dataset))
+
 # Footer
 st.sidebar.markdown("---")
 st.sidebar.markdown("### About")
@@ -91,6 +134,7 @@ if page == "Home":
     
     ### Features:
     - **Three main views**: This Year, Last 2 Years, and Last 3 Years
+    - **Multi-Year Comparison**: Compare any range of years with growth and CAGR for every metric
     - **Interactive visualizations**: Bar charts, pie charts, line charts, and donut charts
     - **Comprehensive analysis**: Ministry-wise allocations, sector-wise expenditure, revenue sources, and more
     - **Custom data upload**: Analyze your own budget data or other countries' budgets
@@ -128,10 +172,13 @@ if page == "Home":
         st.plotly_chart(fig, use_container_width=True)
 
 elif page == "This Year":
-    this_year.show(uploaded_file, sample_data)
+    this_year.show(dataset)
     
 elif page == "Last 2 Years":
-    last_two_years.show(uploaded_file, sample_data)
+    last_two_years.show(dataset)
     
 elif page == "Last 3 Years":
-    last_three_years.show(uploaded_file, sample_data) 
\ No newline at end of file
+    last_three_years.show(dataset)
+    
+elif page == "Multi-Year Comparison":
+    year_window.show(dataset) 
\ No newline at end of file
@@ -0,0 +1,171 @@
+import io
+import os
+import re
+import zipfile
+import pandas as pd
+from utils import excel_engine, hash_upload, merge_sheets, process_uploaded_data, run_in_pool, SUMMARY_COLUMNS
+
+# File types picked up by a batch import
+BATCH_EXTENSIONS = ('.csv', '.xlsx')
+# Worker processes for a batch import (None = one per CPU)
+BATCH_MAX_WORKERS = None
+
+# Server directory whose subdirectories the app may import from (set BUDGET_BATCH_ROOT
+# to enable directory imports in the app; unset, only zip uploads are offered)
+BATCH_ROOT = os.environ.get('BUDGET_BATCH_ROOT')
+
+# Limits of a zip batch, checked from its directory before any member is read: total
+# uncompressed size of the budget files (BUDGET_BATCH_MAX_BYTES) and their number
+BATCH_MAX_BYTES = int(os.environ.get('BUDGET_BATCH_MAX_BYTES', 1024 ** 3))
+BATCH_MAX_FILES = int(os.environ.get('BUDGET_BATCH_MAX_FILES', 1000))
+
+# A year in a file path, e.g. 2024/Defense.csv or defense_2024.csv
+YEAR_PATTERN = re.compile(r'(?<!\d)((?:19|20)\d{2})(?!\d)')
+
+def resolve_batch_dir(path, root=None):
+    """
+    Return the real path of a directory given relative to the batch root
+
+    Raises ValueError when no root is configured, or when the path (after
+    following symlinks and '..') leads outside the root.
+    """
+    root = root or BATCH_ROOT
+    if not root:
+        raise ValueError("directory imports are disabled (BUDGET_BATCH_ROOT is not set)")
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"{path} is outside the batch import directory")
+    if not os.path.isdir(resolved):
+        raise ValueError(f"{path} is not a directory")
+    return resolved
+
+def list_batch_files(source):
+    """
+    Return the budget files of a batch as (name, content) pairs
+
+    source is a directory path, the path of a zip archive, or an uploaded zip
+    file. Directory entries are passed on as paths and read by the workers;
+    zip members are read here, since an open archive cannot be shared.
+    Symlinks pointing outside a directory are skipped. A zip archive whose
+    budget files exceed BATCH_MAX_FILES files or BATCH_MAX_BYTES uncompressed
+    is rejected with a ValueError before any of them is read.
+    """
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        top = os.path.realpath(source)
+        files = []
+        for root, _, names in os.walk(source):
+            for name in names:
+                path = os.path.join(root, name)
+                if name.lower().endswith(BATCH_EXTENSIONS) and os.path.commonpath([top, os.path.realpath(path)]) == top:
+                    files.append((os.path.relpath(path, source), path))
+        return sorted(files)
+
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    try:
+        with zipfile.ZipFile(source) as archive:
+            members = [
+                info for info in archive.infolist()
+                if not info.is_dir() and info.filename.lower().endswith(BATCH_EXTENSIONS)
+                and not os.path.basename(info.filename).startswith('.')
+            ]
+            # Sizes come from the archive directory; reading past them fails in zipfile
+            if len(members) > BATCH_MAX_FILES:
+                raise ValueError(f"the archive has {len(members)} budget files, more than the limit of {BATCH_MAX_FILES}")
+            total = sum(info.file_size for info in members)
+            if total > BATCH_MAX_BYTES:
+                raise ValueError(f"the archive unpacks to {total} bytes, more than the limit of {BATCH_MAX_BYTES}")
+            return sorted((info.filename, archive.read(info)) for info in members)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"not a directory or zip archive: {e}")
+
+def read_batch_file(name, content):
+    """
+    Read and validate one file of a batch (runs in a worker process)
+
+    Returns (name, frame, errors); the frame is None when the file is rejected.
+    A missing Year or Ministry column is filled in from the file's path.
+    """
+    try:
+        source = content if isinstance(content, str) else io.BytesIO(content)
+        if name.lower().endswith('.csv'):
+            df = pd.read_csv(source)
+        else:
+            sheets = pd.read_excel(source, sheet_name=None, engine=excel_engine())
+            df = merge_sheets(list(sheets), list(sheets.values()))
+    except Exception as e:
+        return name, None, [f"could not be read: {e}"]
+
+    if 'Year' not in df.columns:
+        match = YEAR_PATTERN.search(name)
+        if match:
+            df = df.assign(Year=int(match.group(1)))
+    if 'Ministry' not in df.columns and 'Allocation' in df.columns:
+        stem = os.path.splitext(os.path.basename(name))[0]
+        ministry = YEAR_PATTERN.sub('', stem).strip(' _-')
+        if ministry:
+            df = df.assign(Ministry=ministry)
+
+    errors = validate_budget_frame(df)
+    return name, (None if errors else df), errors
+
+def validate_budget_frame(df):
+    """Return the problems that keep a frame from being merged into a dataset"""
+    if df.empty:
+        return ["is empty"]
+
+    errors = []
+    if 'Year' not in df.columns:
+        errors.append("has no Year column and no year in its path")
+    elif not pd.api.types.is_numeric_dtype(df['Year']):
+        errors.append("has non-numeric values in the Year column")
+
+    budget_columns = ['Allocation', *SUMMARY_COLUMNS.values()]
+    if not any(column in df.columns for column in budget_columns):
+        errors.append(f"has none of the columns {', '.join(budget_columns)}")
+    for column in budget_columns:
+        if column in df.columns and not pd.api.types.is_numeric_dtype(df[column]):
+            errors.append(f"has non-numeric values in the {column} column")
+    return errors
+
+def load_batch(source, max_workers=BATCH_MAX_WORKERS, progress=None):
+    """
+    Ingest every budget file of a directory or zip archive into one dataset
+
+    Files are read and validated concurrently in a process pool (sequentially
+    when the pool is unavailable); the valid ones are merged and processed
+    like a single upload. Returns (data, report), where report lists
+    (file name, problems) for every file, with no problems for merged files.
+    progress, if given, is called with the fraction of files done.
+    """
+    # Results come back in file order, so the merge does not depend on worker timing
+    results = run_in_pool(read_batch_file, list_batch_files(source), max_workers, label="Reading batch", progress=progress)
+    report = [(name, errors) for name, _, errors in results]
+    frames = [frame for _, frame, _ in results if frame is not None]
+    if not frames:
+        return None, report
+
+    df = pd.concat(frames, ignore_index=True)
+    # Summary columns are per year; files without them must not mask another file's values
+    for column in SUMMARY_COLUMNS.values():
+        if column in df.columns:
+            df[column] = df.groupby('Year')[column].transform('first')
+    # Summary-only files add no ministry rows, except in years that have none at all
+    if 'Allocation' in df.columns:
+        allocated = df['Allocation'].notna()
+        df = df[allocated | ~allocated.groupby(df['Year']).transform('any')]
+    return process_uploaded_data(df), report
+
+def batch_key(source):
+    """Identify a batch cheaply: file names, sizes and modification times, or the zip's id"""
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        entries = []
+        for name, path in list_batch_files(source):
+            stat = os.stat(path)
+            entries.append((name, stat.st_size, stat.st_mtime_ns))
+        return (os.path.abspath(source), tuple(entries))
+    if isinstance(source, (str, os.PathLike)):
+        stat = os.stat(source)
+        return (os.path.abspath(source), stat.st_size, stat.st_mtime_ns)
+    return (source.name, getattr(source, 'file_id', None) or hash_upload(source))
@@ -0,0 +1,96 @@
+"""
+Benchmark utils.process_uploaded_data against row count and year count.
+
+Compares the single-pass partitioner with the previous per-year mask scan,
+which is O(years x rows). The partitioner also encodes the labels as
+categories (hashing each label column once) and sums repeated rows, which the
+bare scan does not, so the scan is also timed followed by encode_dimensions,
+the same encoding step; the speedup is against that. On few years the bare
+scan stays faster, since it hashes nothing. Data comes from the shared
+generator in synthetic.py. Run from the repository root:
+
+    python benchmarks/bench_process_uploaded_data.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import utils.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import encode_dimensions, process_uploaded_data
+from synthetic import make_upload
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+YEAR_COUNTS = [3, 10, 25]
+REPEATS = 3
+# Ministries per year; schemes per ministry are scaled to reach the row count
+MINISTRIES = 100
+
+
+def shuffled_upload(rows, years, seed=0):
+    """
+    Return about rows rows of the shared synthetic upload (see synthetic.py) over
+    years years, shuffled so that the years are interleaved as in a real export
+    """
+    schemes = max(1, rows // (years * MINISTRIES))
+    df = make_upload(years, MINISTRIES, schemes, seed)
+    order = np.random.default_rng(seed).permutation(len(df))
+    return df.take(order).reset_index(drop=True)
+
+
+def mask_scan(df):
+    """
+    Reference implementation: one boolean mask scan per year
+    (without summing repeated rows or encoding the labels as categories)
+    """
+    data = {}
+    for year in df['Year'].unique():
+        year_data = df[df['Year'] == year]
+        data[year] = {
+            'ministry_allocation': pd.DataFrame({
+                'Ministry': year_data['Ministry'],
+                'Department': year_data['Department'],
+                'Scheme': year_data['Scheme'],
+                'Allocation (in Crores)': year_data['Allocation']
+            }),
+            'budget_summary': {
+                'Total Budget': year_data['Total_Budget'].iloc[0],
+                'Fiscal Deficit': year_data['Fiscal_Deficit'].iloc[0],
+                'Fiscal Deficit %': year_data['Fiscal_Deficit_Percentage'].iloc[0],
+                'GDP': year_data['GDP'].iloc[0]
+            }
+        }
+    return data
+
+
+def encoded_mask_scan(df):
+    """Reference implementation followed by the label encoding process_uploaded_data also does"""
+    return encode_dimensions(mask_scan(df))
+
+
+def best_of(func, df):
+    """Return the fastest of REPEATS runs in milliseconds"""
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    print(f"{'rows':>10} {'years':>6} {'mask scan (ms)':>15} {'scan + encode (ms)':>19} {'partitioned (ms)':>17} {'speedup':>8}")
+    for rows in ROW_COUNTS:
+        for years in YEAR_COUNTS:
+            df = shuffled_upload(rows, years)
+            scan = best_of(mask_scan, df)
+            baseline = best_of(encoded_mask_scan, df)
+            current = best_of(process_uploaded_data, df)
+            print(f"{len(df):>10} {years:>6} {scan:>15.1f} {baseline:>19.1f} {current:>17.1f} {baseline / current:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Benchmark suite for data loading, aggregation and chart construction.
+
+Times every stage on synthetic data of N years x M ministries x K schemes per
+ministry (see synthetic.py) and writes the results as JSON, so runs can be
+compared across releases. Run from the repository root:
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --sizes 3x10x10,10x100x100 --repeats 5 --output bench.json
+
+Cold cases clear the relevant caches before every run; warm cases measure a
+cache hit.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+
+# Keep the benchmark's store out of the repository's
+os.environ.setdefault('BUDGET_STORE_DIR', os.path.join(tempfile.mkdtemp(prefix='budget-bench-'), 'store'))
+
+# Add parent directory to path to import utils.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import store
+import utils
+from utils import (
+    load_data, process_uploaded_data, clear_ingest_cache, clear_figure_cache, format_table,
+    create_bar_chart, create_pie_chart, create_donut_chart, create_line_chart, create_drilldown_chart
+)
+from dataset import BudgetDataset
+from insights import year_insights
+from comparison import YearWindow, YearDeltas
+from hierarchy import BudgetHierarchy
+from search import SearchIndex
+from synthetic import make_upload, make_budget_data, make_csv_upload
+
+DEFAULT_SIZES = ['3x8x1', '10x50x20', '25x100x100']
+REPEATS = 3
+
+
+def measure(func, repeats, setup=None):
+    """Run func repeats times (after setup, untimed) and return the timings in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def upload_store_id(upload):
+    """Return the store id load_data gives a CSV upload"""
+    return utils.upload_dataset_id(utils.hash_upload(upload), True)
+
+
+def cases(years, ministries, schemes):
+    """Return the (name, function, setup) cases of one data size"""
+    upload_df = make_upload(years, ministries, schemes)
+    upload = make_csv_upload(years, ministries, schemes)
+    data = make_budget_data(years, ministries, schemes)
+    dataset = BudgetDataset(data)
+    latest = dataset.latest_year
+    window_years = list(dataset.latest(min(3, years)))
+    window = YearWindow(dataset, window_years)
+    hierarchy = BudgetHierarchy.from_frame(data[latest]['ministry_allocation'])
+    ministries_df = hierarchy.children()
+    summary = dataset.summary.frame()
+    search = dataset.search['ministry_allocation']
+    label_col = 'Ministry'
+    value_col = 'Allocation (in Crores)'
+
+    # Dataset artifacts and insights are memoized per dataset, so every timed run gets a fresh one
+    fresh = []
+
+    def new_dataset():
+        fresh[:] = [BudgetDataset(data)]
+
+    def cold_upload():
+        clear_ingest_cache()
+        store.delete_dataset(upload_store_id(upload))
+
+    def chart_cases(name, build):
+        return [
+            (f'{name} (cold)', build, clear_figure_cache),
+            (f'{name} (cached)', build, None)
+        ]
+
+    return [
+        ('load_data csv (parse)', lambda: load_data(upload, use_sample=False), cold_upload),
+        ('load_data csv (store)', lambda: load_data(upload, use_sample=False), clear_ingest_cache),
+        ('load_data csv (memory)', lambda: load_data(upload, use_sample=False), None),
+        ('process_uploaded_data', lambda: process_uploaded_data(upload_df), None),
+        ('BudgetDataset', lambda: BudgetDataset(data), None),
+        ('dataset cube and search indexes', lambda: fresh[0].search, new_dataset),
+        ('insights', lambda: [year_insights(fresh[0], year) for year in fresh[0].years], new_dataset),
+        ('comparison window pivots', lambda: YearWindow(dataset, window_years), None),
+        ('comparison window table', lambda: window.table('ministry_allocation'), None),
+        ('year-over-year deltas', lambda: YearDeltas(dataset), None),
+        ('hierarchy rollup index', lambda: BudgetHierarchy.from_frame(data[latest]['ministry_allocation']), None),
+        ('search index build', lambda: SearchIndex(dataset.cube.entities['ministry_allocation']), None),
+        ('search query', lambda: search.search('ministry 4'), None),
+        ('format_table', lambda: format_table(data[latest]['ministry_allocation'], currency_columns=[value_col]), None),
+        *chart_cases('create_bar_chart', lambda: create_bar_chart(ministries_df, label_col, value_col, 'Bar', horizontal=True)),
+        *chart_cases('create_pie_chart', lambda: create_pie_chart(ministries_df, value_col, label_col, 'Pie')),
+        *chart_cases('create_donut_chart', lambda: create_donut_chart(ministries_df, value_col, label_col, 'Donut')),
+        *chart_cases('create_line_chart', lambda: create_line_chart(summary.index, summary['Total Budget'], 'Line')),
+        *chart_cases('create_drilldown_chart', lambda: create_drilldown_chart(ministries_df, label_col, value_col, 'Total', 'Treemap')),
+    ]
+
+
+def parse_size(size):
+    """Parse an NxMxK size string into (years, ministries, schemes)"""
+    try:
+        years, ministries, schemes = (int(part) for part in size.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"size must look like 10x50x20 (years x ministries x schemes), got {size!r}")
+    return years, ministries, schemes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark data loading, aggregation and chart construction.")
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES),
+                        help="comma-separated YEARSxMINISTRIESxSCHEMES sizes (default: %(default)s)")
+    parser.add_argument('--repeats', type=int, default=REPEATS, help="runs per case (default: %(default)s)")
+    parser.add_argument('--output', help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+
+    results = []
+    for years, ministries, schemes in sizes:
+        for name, func, setup in cases(years, ministries, schemes):
+            timings = measure(func, args.repeats, setup)
+            results.append({
+                'case': name,
+                'years': years,
+                'ministries': ministries,
+                'schemes': schemes,
+                'rows': years * ministries * schemes,
+                'best_ms': round(min(timings), 3),
+                'median_ms': round(statistics.median(timings), 3),
+                'repeats': args.repeats
+            })
+            print(f"{years}x{ministries}x{schemes:<8} {name:<32} {min(timings):>10.2f} ms", file=sys.stderr)
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'plotly': plotly.__version__
+        },
+        'results': results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Synthetic budget data scaled from the get_sample_data schema.
+
+N years x M ministries x K schemes per ministry, with departments between
+ministries and schemes, plus the sector, revenue and spending type tables and
+the budget summary of every year. Generation is seeded, so every run of the
+benchmarks sees the same data.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+SECTORS = ['Infrastructure', 'Healthcare', 'Education', 'Defense', 'Agriculture', 'Social Welfare', 'Others']
+REVENUE_SOURCES = ['Income Tax', 'Corporate Tax', 'GST', 'Customs', 'Excise Duty', 'Non-Tax Revenue', 'Borrowings']
+DEPARTMENTS_PER_MINISTRY = 5
+
+
+def make_upload(years, ministries, schemes, seed=0):
+    """
+    Build an upload frame with one row per (year, ministry, department, scheme),
+    in the column layout process_uploaded_data reads
+    """
+    rng = np.random.default_rng(seed)
+    year_values = np.arange(2024 - years + 1, 2025)
+    rows_per_year = ministries * schemes
+
+    ministry = np.repeat(np.arange(ministries), schemes)
+    scheme = np.arange(rows_per_year)
+    department = rng.integers(0, DEPARTMENTS_PER_MINISTRY, size=rows_per_year)
+
+    # Allocations grow by a few percent a year
+    base = rng.uniform(1, 1e4, size=rows_per_year)
+    growth = rng.uniform(1.0, 1.12, size=(years, 1))
+    allocation = (base * np.cumprod(growth, axis=0)).ravel()
+
+    year = np.repeat(year_values, rows_per_year)
+    total_budget = np.repeat(allocation.reshape(years, -1).sum(axis=1), rows_per_year)
+    gdp = total_budget * 4.2
+
+    return pd.DataFrame({
+        'Year': year,
+        'Ministry': np.tile(np.char.add('Ministry ', ministry.astype(str)), years),
+        'Department': np.tile(np.char.add(np.char.add('Department ', ministry.astype(str)), np.char.add('-', department.astype(str))), years),
+        'Scheme': np.tile(np.char.add('Scheme ', scheme.astype(str)), years),
+        'Allocation': allocation,
+        'Total_Budget': total_budget,
+        'Fiscal_Deficit': total_budget * 0.24,
+        'Fiscal_Deficit_Percentage': np.round(total_budget * 0.24 / gdp * 100, 2),
+        'GDP': gdp
+    })
+
+
+def make_budget_data(years, ministries, schemes, seed=0):
+    """Build a dataset dictionary in the get_sample_data schema, with the hierarchy columns"""
+    from utils import encode_dimensions
+
+    upload = make_upload(years, ministries, schemes, seed)
+    rng = np.random.default_rng(seed + 1)
+    data = {}
+    for year, rows in upload.groupby('Year', sort=True):
+        total = rows['Allocation'].sum()
+        sector_share = rng.dirichlet(np.ones(len(SECTORS)))
+        revenue_share = rng.dirichlet(np.ones(len(REVENUE_SOURCES)))
+        capital_share = rng.uniform(0.2, 0.35)
+        gdp = rows['GDP'].iloc[0]
+        data[int(year)] = {
+            'ministry_allocation': pd.DataFrame({
+                'Ministry': rows['Ministry'].to_numpy(),
+                'Department': rows['Department'].to_numpy(),
+                'Scheme': rows['Scheme'].to_numpy(),
+                'Allocation (in Crores)': rows['Allocation'].to_numpy()
+            }),
+            'sector_expenditure': pd.DataFrame({
+                'Sector': SECTORS,
+                'Expenditure (in Crores)': sector_share * total
+            }),
+            'revenue_sources': pd.DataFrame({
+                'Source': REVENUE_SOURCES,
+                'Amount (in Crores)': revenue_share * total
+            }),
+            'spending_type': pd.DataFrame({
+                'Type': ['Capital Expenditure', 'Revenue Expenditure'],
+                'Amount (in Crores)': [capital_share * total, (1 - capital_share) * total]
+            }),
+            'budget_summary': {
+                'Total Budget': total,
+                'Fiscal Deficit': total * 0.24,
+                'Fiscal Deficit %': round(total * 0.24 / gdp * 100, 2),
+                'Revenue Deficit': total * 0.15,
+                'Revenue Deficit %': round(total * 0.15 / gdp * 100, 2),
+                'GDP': gdp
+            }
+        }
+    return encode_dimensions(data)
+
+
+class SyntheticUpload(io.BytesIO):
+    """In-memory stand-in for a Streamlit UploadedFile"""
+
+    def __init__(self, content, name):
+        super().__init__(content)
+        self.name = name
+        self.size = len(content)
+
+
+def make_csv_upload(years, ministries, schemes, seed=0):
+    """Return the synthetic upload as a CSV file object"""
+    content = make_upload(years, ministries, schemes, seed).to_csv(index=False).encode()
+    return SyntheticUpload(content, f'synthetic-{years}x{ministries}x{schemes}.csv')
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+from utils import TABLE_COLUMNS
+from cube import growth
+
+class YearWindow:
+    """
+    Comparison of a dataset over any window of years
+
+    Built in one vectorized pass over the dataset's cube: per-category pivots
+    (entity x year), the change and CAGR from the first to the last year of
+    the window for every entity, and the budget summary with its growth.
+    Entities missing in a year count as 0 there, as in an outer merge.
+    """
+
+    def __init__(self, dataset, years):
+        # Chronological window
+        self.years = tuple(sorted(years))
+        self.start_year = self.years[0]
+        self.end_year = self.years[-1]
+        self.span = self.end_year - self.start_year
+
+        # Budget summary, one row per year, of every metric with a value in the window;
+        # a year lacking a metric has NaN there
+        summary = dataset.summary
+        metrics = summary.metrics_in(self.years)
+        self.summary = summary.frame(self.years, metrics)
+        values = self.summary.to_numpy()
+        change, cagr = summary.growth(self.start_year, self.end_year, metrics)
+        self.summary_growth = pd.DataFrame({
+            'Metric': metrics,
+            str(self.start_year): values[0],
+            str(self.end_year): values[-1],
+            'Change (%)': change,
+            'CAGR (%)': cagr
+        })
+
+        # Per-category pivots straight from the cube's dense arrays
+        cube = dataset.cube
+        columns = [cube.year_index[year] for year in self.years]
+        self.pivots = {}
+        for category, cube_values in cube.values.items():
+            block = cube_values[:, columns]
+            present = ~np.isnan(block).all(axis=1)
+            block = np.nan_to_num(block[present])
+            labels = np.asarray(cube.entities[category], dtype=object)[present]
+            change, cagr = growth(block[:, 0], block[:, -1], self.span)
+
+            label_col = TABLE_COLUMNS[category][0]
+            pivot = pd.DataFrame(block, columns=list(self.years))
+            pivot.insert(0, label_col, labels)
+            pivot['Change (%)'] = change
+            pivot['CAGR (%)'] = cagr
+
+            # Largest entities in the latest year first
+            order = np.argsort(-block[:, -1], kind='stable')
+            self.pivots[category] = pivot.iloc[order].reset_index(drop=True)
+
+    def has_category(self, category):
+        """Check whether the window holds data for a category"""
+        return category in self.pivots
+
+    def table(self, category):
+        """
+        Return a display table for a category: one value column per year
+        (latest first, named like 'Allocation (in Crores) (2024)') and the change
+        """
+        label_col, value_col = TABLE_COLUMNS[category]
+        pivot = self.pivots[category]
+        table = pivot[[label_col, *self.years[::-1], 'Change (%)']]
+        return table.rename(columns={year: f'{value_col} ({year})' for year in self.years})
+
+    def long(self, category):
+        """
+        Return a category in long format for plotting, with the years as
+        strings so that Plotly treats them as discrete
+        """
+        label_col, value_col = TABLE_COLUMNS[category]
+        pivot = self.pivots[category]
+        long_df = pivot.melt(id_vars=[label_col], value_vars=list(self.years), var_name='Year', value_name=value_col)
+        long_df['Year'] = long_df['Year'].astype(str)
+        return long_df
+
+    def totals(self, category):
+        """Return the yearly total of a category, indexed by year"""
+        return self.pivots[category][list(self.years)].sum()
+
+class YearDeltas:
+    """
+    Year-over-year deltas for every adjacent pair of years in a dataset
+
+    For each category and for the budget summary, the absolute change, the
+    percent change and (for categories) the change in share of the yearly
+    total in percentage points are computed for all pairs at once from the
+    cube, then turned into display tables on first use. As in YearWindow,
+    entities missing in one year of a pair count as 0 there.
+    """
+
+    def __init__(self, dataset):
+        cube = dataset.cube
+        # Chronological years; pair i runs from years[i] to years[i + 1]
+        self.years = cube.years
+        self.pair_index = {end: i for i, end in enumerate(self.years[1:])}
+        self.entities = cube.entities
+
+        # Per-category arrays of shape (entities, pairs)
+        self.values = {}
+        self.absolute = {}
+        self.percent = {}
+        self.shares = {}
+        self.share_points = {}
+        # Entities with a value in either year of each pair
+        self._present = {}
+        for category, cube_values in cube.values.items():
+            present = ~np.isnan(cube_values)
+            values = np.nan_to_num(cube_values)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                shares = values / values.sum(axis=0) * 100
+                self.percent[category] = (values[:, 1:] - values[:, :-1]) / values[:, :-1] * 100
+            self.values[category] = values
+            self.absolute[category] = np.diff(values, axis=1)
+            self.shares[category] = shares
+            self.share_points[category] = np.diff(shares, axis=1)
+            self._present[category] = present[:, 1:] | present[:, :-1]
+
+        # Budget summary of every metric; a year lacking a metric has NaN deltas there
+        self.summary_metrics = list(dataset.summary.metrics)
+        summary_values = dataset.summary.frame(self.years, self.summary_metrics).to_numpy()
+        self.summary_values = summary_values
+        self.summary_absolute = np.diff(summary_values, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.summary_percent = self.summary_absolute / summary_values[:-1] * 100
+
+        self._tables = {}
+
+    def has_pair(self, year):
+        """Check whether year has a previous year to compare against"""
+        return year in self.pair_index
+
+    def previous_year(self, year):
+        """Return the year before year in the dataset"""
+        return self.years[self.pair_index[year]]
+
+    def summary(self, year):
+        """
+        Return the budget summary deltas from the previous year to year,
+        indexed by metric (Previous, Current, Change, Change (%))
+        """
+        i = self.pair_index[year]
+        return pd.DataFrame({
+            'Previous': self.summary_values[i],
+            'Current': self.summary_values[i + 1],
+            'Change': self.summary_absolute[i],
+            'Change (%)': self.summary_percent[i]
+        }, index=pd.Index(self.summary_metrics, name='Metric'))
+
+    def table(self, category, year):
+        """
+        Return the delta table of a category from the previous year to year
+
+        Columns are the label, the values of both years (latest first, named like
+        'Allocation (in Crores) (2024)'), Change, Change (%), both years' shares of
+        the total and Share Change (pp); largest entities in year first.
+        """
+        key = (category, year)
+        if key not in self._tables:
+            self._tables[key] = self._build_table(category, year)
+        return self._tables[key]
+
+    def _build_table(self, category, year):
+        """Slice one pair out of the precomputed arrays"""
+        label_col, value_col = TABLE_COLUMNS[category]
+        i = self.pair_index[year]
+        previous = self.years[i]
+        rows = np.flatnonzero(self._present[category][:, i])
+        values = self.values[category]
+        shares = self.shares[category]
+
+        table = pd.DataFrame({
+            label_col: np.asarray(self.entities[category], dtype=object)[rows],
+            f'{value_col} ({year})': values[rows, i + 1],
+            f'{value_col} ({previous})': values[rows, i],
+            'Change': self.absolute[category][rows, i],
+            'Change (%)': self.percent[category][rows, i],
+            f'Share (%) ({year})': shares[rows, i + 1],
+            f'Share (%) ({previous})': shares[rows, i],
+            'Share Change (pp)': self.share_points[category][rows, i]
+        })
+
+        order = np.argsort(-values[rows, i + 1], kind='stable')
+        return table.iloc[order].reset_index(drop=True)
+
+def compare_window(dataset, years):
+    """Return the YearWindow for the given years, built once per dataset"""
+    years = tuple(sorted(years))
+    return dataset.memo(('year_window', years), lambda: YearWindow(dataset, years))
+
+def year_deltas(dataset):
+    """Return the adjacent-year deltas of a dataset, built once per dataset"""
+    return dataset.memo('year_deltas', lambda: YearDeltas(dataset))
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+from utils import TABLE_COLUMNS, SUMMARY_METRICS
+
+class BudgetCube:
+    """
+    Dense multi-year cube of budget values indexed by (category, entity, year)
+
+    Each category (a per-year table such as ministry_allocation) is held as a
+    float array of shape (entities, years), with years in chronological order
+    and NaN where an entity has no value for a year. Label dictionaries map
+    entity names and years to array positions, so any entity and year range
+    is an array slice.
+    """
+
+    def __init__(self, years, entities, values):
+        # Chronological years and their column positions
+        self.years = tuple(years)
+        self.year_array = np.asarray(self.years)
+        self.year_index = {year: i for i, year in enumerate(self.years)}
+        # Sorted entity labels per category and their row positions
+        self.entities = entities
+        self.entity_index = {
+            category: {label: i for i, label in enumerate(labels)}
+            for category, labels in entities.items()
+        }
+        self.values = values
+
+    @classmethod
+    def from_long_tables(cls, long_tables, years):
+        """Build the cube from year-tagged long tables (see BudgetDataset.long_tables)"""
+        years = sorted(years)
+        year_index = {year: i for i, year in enumerate(years)}
+        entities = {}
+        values = {}
+
+        for category, (label_col, value_col) in TABLE_COLUMNS.items():
+            frame = long_tables.get(category)
+            if frame is None or label_col not in frame.columns or value_col not in frame.columns:
+                continue
+
+            column = frame[label_col]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # Dimension columns are already integer-coded (see utils.encode_dimensions)
+                rows, labels = column.cat.codes.to_numpy(), column.cat.categories
+            else:
+                rows, labels = pd.factorize(column, sort=True)
+            cols = frame['Year'].map(year_index).to_numpy()
+            amounts = pd.to_numeric(frame[value_col], errors='coerce').to_numpy(dtype=float)
+            keep = rows >= 0
+
+            # Sum repeated (entity, year) rows; cells that never receive a value stay NaN
+            cube = np.zeros((len(labels), len(years)))
+            present = np.zeros(cube.shape, dtype=bool)
+            np.add.at(cube, (rows[keep], cols[keep]), amounts[keep])
+            present[rows[keep], cols[keep]] = True
+            cube[~present] = np.nan
+
+            entities[category] = tuple(labels)
+            values[category] = cube
+
+        return cls(years, entities, values)
+
+    def year_slice(self, start_year=None, end_year=None):
+        """Return the column slice covering start_year..end_year (inclusive)"""
+        start = 0 if start_year is None else self.year_index[start_year]
+        end = len(self.years) if end_year is None else self.year_index[end_year] + 1
+        return slice(start, end)
+
+    def series(self, category, entity, start_year=None, end_year=None):
+        """Return (years, values) for one entity over a year range, skipping missing years"""
+        columns = self.year_slice(start_year, end_year)
+        values = self.values[category][self.entity_index[category][entity], columns]
+        years = self.year_array[columns]
+        present = ~np.isnan(values)
+        return years[present], values[present]
+
+    def present_in(self, category, years):
+        """Return a boolean mask over a category's entities: has a value in any of the given years"""
+        columns = [self.year_index[year] for year in years]
+        return ~np.isnan(self.values[category][:, columns]).all(axis=1)
+
+    def entities_in(self, category, years):
+        """Return the sorted entities of a category that have a value in any of the given years"""
+        labels = self.entities[category]
+        return [labels[i] for i in np.flatnonzero(self.present_in(category, years))]
+
+    def has_category(self, category):
+        """Check whether the cube holds a category"""
+        return category in self.values
+
+class SummaryTable:
+    """
+    Columnar budget summary across years: one row per year, one column per metric
+
+    Values are a float array of shape (years, metrics) in column-major order,
+    with years chronological and NaN where a year lacks a metric, so a metric's
+    trend over any year range is a single contiguous column read and growth
+    and CAGR are vectorized over years and metrics.
+    """
+
+    def __init__(self, years, metrics, values):
+        # Chronological years and their row positions
+        self.years = tuple(years)
+        self.year_array = np.asarray(self.years)
+        self.year_index = {year: i for i, year in enumerate(self.years)}
+        # Metrics and their column positions
+        self.metrics = tuple(metrics)
+        self.metric_index = {metric: i for i, metric in enumerate(self.metrics)}
+        self.values = np.asfortranarray(values, dtype=float)
+
+    @classmethod
+    def from_summaries(cls, summaries):
+        """Build the table from per-year summary dicts ({year: budget_summary})"""
+        years = sorted(summaries)
+        # Known metrics first, in display order, then any other metric in first-seen order
+        seen = []
+        for year in years:
+            for metric in summaries[year]:
+                if metric not in seen:
+                    seen.append(metric)
+        metrics = [metric for metric in SUMMARY_METRICS if metric in seen]
+        metrics += [metric for metric in seen if metric not in SUMMARY_METRICS]
+
+        values = np.full((len(years), len(metrics)), np.nan, order='F')
+        for row, year in enumerate(years):
+            summary = summaries[year]
+            for col, metric in enumerate(metrics):
+                try:
+                    values[row, col] = float(summary[metric])
+                except (KeyError, TypeError, ValueError):
+                    # Missing or non-numeric metrics stay NaN
+                    pass
+
+        return cls(years, metrics, values)
+
+    def rows(self, years=None):
+        """Return the row positions of the given years (default: every year)"""
+        if years is None:
+            return np.arange(len(self.years))
+        return np.array([self.year_index[year] for year in years], dtype=np.int64)
+
+    def column(self, metric, start_year=None, end_year=None):
+        """Return (years, values) of one metric over start_year..end_year (inclusive)"""
+        start = 0 if start_year is None else self.year_index[start_year]
+        end = len(self.years) if end_year is None else self.year_index[end_year] + 1
+        return self.year_array[start:end], self.values[start:end, self.metric_index[metric]]
+
+    def metrics_in(self, years=None):
+        """Return the metrics that have a value in at least one of the given years"""
+        present = ~np.isnan(self.values[self.rows(years)]).all(axis=0)
+        return [metric for metric, ok in zip(self.metrics, present) if ok]
+
+    def frame(self, years=None, metrics=None):
+        """Return a DataFrame of the given years and metrics, indexed by Year"""
+        rows = self.rows(years)
+        metrics = list(self.metrics if metrics is None else metrics)
+        columns = [self.metric_index[metric] for metric in metrics]
+        return pd.DataFrame(
+            self.values[np.ix_(rows, columns)],
+            index=pd.Index(self.year_array[rows], name='Year'),
+            columns=metrics
+        )
+
+    def growth(self, start_year, end_year, metrics=None):
+        """Return the percent change and CAGR of the given metrics from start_year to end_year"""
+        metrics = self.metrics if metrics is None else metrics
+        columns = [self.metric_index[metric] for metric in metrics]
+        start = self.values[self.year_index[start_year], columns]
+        end = self.values[self.year_index[end_year], columns]
+        return growth(start, end, end_year - start_year)
+
+def growth(start, end, span):
+    """Return the percent change and CAGR from start to end values over span years"""
+    start = np.asarray(start, dtype=float)
+    end = np.asarray(end, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (end - start) / start * 100
+        if span > 0:
+            cagr = ((end / start) ** (1 / span) - 1) * 100
+        else:
+            cagr = np.full(start.shape, np.nan)
+    return change, cagr
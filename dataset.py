@@ -0,0 +1,178 @@
+import threading
+import pandas as pd
+from collections.abc import Mapping
+from types import MappingProxyType
+from utils import load_data, hash_upload
+from cube import BudgetCube, SummaryTable
+from batch import load_batch, batch_key
+from search import SearchIndex
+
+# Key under which the current dataset is memoized in the session state
+SESSION_KEY = 'budget_dataset'
+# Key under which the per-file report of the last batch import is kept
+BATCH_REPORT_KEY = 'budget_batch_report'
+
+class BudgetDataset(Mapping):
+    """
+    Immutable per-year budget dataset shared by every view
+
+    Behaves like the dictionary returned by load_data (dataset[year][table]),
+    and also exposes the year list, the latest year and per-table frames,
+    precomputed once, and the long tables, cube and search indexes, built on
+    first use or by the background precompute job (see precompute.py).
+    Frames are shared between views and must be treated as read-only.
+    """
+
+    def __init__(self, data, key=None):
+        years = tuple(sorted(data.keys(), reverse=True))
+        by_year = {
+            year: MappingProxyType(dict(data[year]))
+            for year in years
+        }
+        table_names = []
+        for year in years:
+            for name in data[year]:
+                if name not in table_names:
+                    table_names.append(name)
+        tables = {
+            name: MappingProxyType({year: data[year][name] for year in years if name in data[year]})
+            for name in table_names
+        }
+
+        object.__setattr__(self, 'key', key)
+        # Years from latest to earliest, the order the views present them in
+        object.__setattr__(self, 'years', years)
+        object.__setattr__(self, 'latest_year', years[0] if years else None)
+        # Per-table frames keyed by year: tables['ministry_allocation'][2024]
+        object.__setattr__(self, 'tables', MappingProxyType(tables))
+        object.__setattr__(self, '_by_year', MappingProxyType(by_year))
+
+        # Budget summary of every year as one columnar table
+        object.__setattr__(self, 'summary', SummaryTable.from_summaries({
+            year: by_year[year].get('budget_summary', {}) for year in years
+        }))
+
+        # Derived artifacts (long tables, cube, comparison windows, ...) built on first use, possibly
+        # by the background precompute worker; one lock per artifact being built
+        object.__setattr__(self, '_memo', {})
+        object.__setattr__(self, '_memo_locks', {})
+        object.__setattr__(self, '_memo_lock', threading.Lock())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BudgetDataset is immutable")
+
+    def __getitem__(self, year):
+        return self._by_year[year]
+
+    def __iter__(self):
+        return iter(self.years)
+
+    def __len__(self):
+        return len(self.years)
+
+    @property
+    def long_tables(self):
+        """Year-tagged long table of every category, built once; the cube is built from them"""
+        return self.memo('long_tables', lambda: MappingProxyType({
+            name: _stack_years(frames, self.years)
+            for name, frames in self.tables.items()
+            if all(isinstance(frame, pd.DataFrame) for frame in frames.values())
+        }))
+
+    @property
+    def cube(self):
+        """Dense (category, entity, year) cube for O(1) trend lookups, built once"""
+        return self.memo('cube', lambda: BudgetCube.from_long_tables(self.long_tables, self.years))
+
+    @property
+    def search(self):
+        """Name search index per category, driving the entity pickers, built once"""
+        return self.memo('search', lambda: MappingProxyType({
+            category: SearchIndex(labels) for category, labels in self.cube.entities.items()
+        }))
+
+    def latest(self, n):
+        """Return the latest n years, latest first"""
+        return self.years[:n]
+
+    def has_table(self, name, years=None):
+        """Check whether a table is available for all the given years (default: every year)"""
+        available = self.tables.get(name, {})
+        return all(year in available for year in (self.years if years is None else years))
+
+    def memo(self, key, build):
+        """
+        Return the derived artifact stored under key, building it on first use
+
+        Safe to call from several threads: every artifact is built once, and a
+        caller asking for one that is being built waits for it.
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        with self._memo_lock:
+            lock = self._memo_locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._memo:
+                self._memo[key] = build()
+            return self._memo[key]
+
+def _stack_years(frames, years):
+    """Stack per-year frames into one long table with a Year column, latest year first"""
+    parts = [frames[year].assign(Year=year) for year in years if year in frames]
+    if not parts:
+        return pd.DataFrame({'Year': []})
+    return pd.concat(parts, ignore_index=True)
+
+def get_dataset(uploaded_file=None, use_sample=True, state=None, progress=None):
+    """
+    Return the dataset for the current upload, built at most once per session
+
+    state is a mutable mapping such as st.session_state; the dataset is
+    memoized there and reused until the upload or the sample choice changes.
+    """
+    key = _dataset_key(uploaded_file, use_sample)
+
+    if state is not None:
+        cached = state.get(SESSION_KEY)
+        if cached is not None and cached.key == key:
+            return cached
+
+    data = load_data(uploaded_file, use_sample, progress=progress)
+    dataset = BudgetDataset(data, key=key) if data else None
+
+    if state is not None:
+        state[SESSION_KEY] = dataset
+    return dataset
+
+def get_batch_dataset(source, state=None, progress=None):
+    """
+    Return the dataset merged from a directory or zip archive of budget files,
+    built at most once per session (see batch.load_batch)
+
+    The per-file validation report is kept in state under BATCH_REPORT_KEY.
+    """
+    key = ('batch',) + batch_key(source)
+
+    if state is not None:
+        cached = state.get(SESSION_KEY)
+        if cached is not None and cached.key == key:
+            return cached
+
+    data, report = load_batch(source, progress=progress)
+    dataset = BudgetDataset(data, key=key) if data else None
+
+    if state is not None:
+        state[SESSION_KEY] = dataset
+        state[BATCH_REPORT_KEY] = report
+    return dataset
+
+def _dataset_key(uploaded_file, use_sample):
+    """Identify an upload cheaply, falling back to a content hash"""
+    if uploaded_file is None:
+        return ('sample',) if use_sample else None
+    file_id = getattr(uploaded_file, 'file_id', None)
+    if file_id is None:
+        file_id = hash_upload(uploaded_file)
+    return ('upload', uploaded_file.name, file_id, use_sample)
@@ -0,0 +1,239 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from utils import (
+    CHART_TOP_N, TABLE_COLUMNS, create_bar_chart, create_pie_chart, create_donut_chart,
+    create_line_chart, create_drilldown_chart
+)
+
+# Display title of every category
+CATEGORY_TITLES = {
+    'ministry_allocation': "Ministry-wise Budget Allocation",
+    'sector_expenditure': "Sector-wise Expenditure",
+    'revenue_sources': "Revenue Sources",
+    'spending_type': "Capital vs Revenue Expenditure"
+}
+
+# Single-year charts per category: bar chart title (None = no bar chart), whether the
+# bars are horizontal, share chart function and share chart title
+YEAR_CHARTS = {
+    'ministry_allocation': ("Ministry-wise Budget Allocation", True, create_pie_chart, "Proportion of Budget Allocation by Ministry"),
+    'sector_expenditure': ("Sector-wise Expenditure", True, create_donut_chart, "Proportion of Expenditure by Sector"),
+    'revenue_sources': ("Revenue Sources", False, create_pie_chart, "Proportion of Revenue by Source"),
+    'spending_type': (None, False, create_pie_chart, "Capital vs Revenue Expenditure")
+}
+
+# Title and y-axis label of the trend line of each budget summary metric
+# (other metrics use '<metric> Trend' and the metric name)
+SUMMARY_TREND_LABELS = {
+    'Total Budget': ("Total Budget Trend", "Budget (in Crores)"),
+    'GDP': ("GDP Trend", "GDP (in Crores)"),
+    'Fiscal Deficit': ("Fiscal Deficit Trend", "Deficit (in Crores)"),
+    'Fiscal Deficit %': ("Fiscal Deficit % of GDP Trend", "Deficit (% of GDP)")
+}
+
+# Title of one entity's trend line per category
+ENTITY_TREND_TITLES = {
+    'ministry_allocation': "{} Budget Allocation Trend",
+    'sector_expenditure': "{} Expenditure Trend",
+    'revenue_sources': "{} Revenue Trend",
+    'spending_type': "{} Trend"
+}
+
+# Layout of the grouped bar chart comparing two years, per category
+COMPARISON_LAYOUT = {
+    'ministry_allocation': {'height': 500, 'xaxis_tickangle': -45},
+    'sector_expenditure': {'height': 500},
+    'revenue_sources': {'height': 500, 'xaxis_tickangle': -45},
+    'spending_type': {'height': 400}
+}
+
+# Entities plotted in the multi-year trend chart of each category
+TOP_ENTITIES = 10
+
+# Font sizes shared by the Plotly Express figures
+TITLE_FONTS = {'title_font_size': 20, 'xaxis_title_font_size': 16, 'yaxis_title_font_size': 16}
+
+def year_bar_figure(category, frame, year):
+    """Return the bar chart of one category of a year, as in the This Year view"""
+    label_col, value_col = TABLE_COLUMNS[category]
+    title, horizontal, _, _ = YEAR_CHARTS[category]
+    return create_bar_chart(frame, label_col, value_col, f"{title} ({year})", horizontal=horizontal)
+
+def year_share_figure(category, frame, year):
+    """Return the pie or donut chart of one category of a year, as in the This Year view"""
+    label_col, value_col = TABLE_COLUMNS[category]
+    _, _, create_chart, title = YEAR_CHARTS[category]
+    return create_chart(frame, value_col, label_col, f"{title} ({year})")
+
+def year_figures(category, frame, year):
+    """Return the (name, figure) charts of one category of a year"""
+    figures = []
+    if YEAR_CHARTS[category][0] is not None:
+        figures.append((f"{category}-bar", year_bar_figure(category, frame, year)))
+    figures.append((f"{category}-share", year_share_figure(category, frame, year)))
+    return figures
+
+def capital_gauge_figure(spending_df):
+    """Return the gauge of capital expenditure as a share of total expenditure"""
+    amounts = spending_df['Amount (in Crores)']
+    capital_percentage = (amounts[spending_df['Type'] == 'Capital Expenditure'].iloc[0] / amounts.sum()) * 100
+
+    return go.Figure(go.Indicator(
+        mode = "gauge+number",
+        value = capital_percentage,
+        title = {'text': "Capital Expenditure (% of Total)"},
+        gauge = {
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "royalblue"},
+            'steps': [
+                {'range': [0, 20], 'color': "lightcoral"},
+                {'range': [20, 40], 'color': "lightsalmon"},
+                {'range': [40, 60], 'color': "lightgreen"},
+                {'range': [60, 80], 'color': "mediumseagreen"},
+                {'range': [80, 100], 'color': "seagreen"}
+            ]
+        }
+    ))
+
+def drilldown_figure(hierarchy, year, path=(), kind='treemap'):
+    """Return the treemap or sunburst of the children of the node at path of a year's hierarchy"""
+    level = hierarchy.levels[len(path)]
+    node_label = path[-1] if path else f"Union Budget {year}"
+    return create_drilldown_chart(
+        hierarchy.children(tuple(path)),
+        level,
+        'Allocation (in Crores)',
+        node_label,
+        f"{level}-wise Allocation: {node_label}",
+        kind=kind
+    )
+
+def summary_trend_figures(summary, metrics=None):
+    """Return the (name, figure) trend lines of budget summary metrics, from a frame indexed by Year"""
+    figures = []
+    for metric in (summary.columns if metrics is None else metrics):
+        title, y_label = SUMMARY_TREND_LABELS.get(metric, (f"{metric} Trend", metric))
+        figures.append((f"trend-{metric}", create_line_chart(
+            summary.index,
+            summary[metric],
+            title,
+            {"x": "Year", "y": y_label}
+        )))
+    return figures
+
+def entity_trend_figure(category, label, years, values):
+    """Return the trend line of one entity (a ministry, sector, ...) over the given years"""
+    return create_line_chart(
+        years,
+        values,
+        ENTITY_TREND_TITLES[category].format(label),
+        {"x": "Year", "y": TABLE_COLUMNS[category][1]}
+    )
+
+def comparison_bar_figure(window, category):
+    """Return the grouped bar chart of a category's largest entities in both years of a 2-year window"""
+    label_col, value_col = TABLE_COLUMNS[category]
+    top_labels = window.pivots[category][label_col].head(CHART_TOP_N)
+    long_df = window.long(category)
+    layout = dict(COMPARISON_LAYOUT[category])
+
+    fig = px.bar(
+        long_df[long_df[label_col].isin(top_labels)],
+        x=label_col,
+        y=value_col,
+        color='Year',
+        barmode='group',
+        title=f"{CATEGORY_TITLES[category]}: {window.end_year} vs {window.start_year}",
+        height=layout.pop('height')
+    )
+    fig.update_layout(**TITLE_FONTS, legend_title_font_size=16, **layout)
+    return fig
+
+def top_increase_figure(ministry_deltas, previous_year, current_year):
+    """Return the bar chart of the 5 ministries with the highest percent increase, from a YearDeltas table"""
+    top_increase = ministry_deltas.nlargest(5, 'Change (%)')
+
+    fig = px.bar(
+        top_increase,
+        x='Ministry',
+        y='Change (%)',
+        title=f"Top 5 Ministries with Highest Budget Increase ({previous_year} to {current_year})",
+        color='Change (%)',
+        color_continuous_scale='Greens',
+        height=400
+    )
+    fig.update_layout(**TITLE_FONTS)
+    return fig
+
+def sector_stack_figure(window):
+    """Return the stacked bar chart of every sector's expenditure across the window"""
+    fig = px.bar(
+        window.long('sector_expenditure'),
+        x='Year',
+        y='Expenditure (in Crores)',
+        color='Sector',
+        title="Sector-wise Expenditure Across Years",
+        height=500
+    )
+    fig.update_layout(**TITLE_FONTS, legend_title_font_size=16)
+    return fig
+
+def revenue_area_figure(window):
+    """Return the area chart of every revenue source across the window"""
+    fig = px.area(
+        window.long('revenue_sources').sort_values(['Year', 'Source']),
+        x='Year',
+        y='Amount (in Crores)',
+        color='Source',
+        title="Revenue Sources Trend",
+        height=500
+    )
+    fig.update_layout(**TITLE_FONTS, legend_title_font_size=16)
+    return fig
+
+def total_revenue_figure(window):
+    """Return the trend line of total revenue across the window"""
+    yearly_total = window.totals('revenue_sources')
+    return create_line_chart(
+        yearly_total.index,
+        yearly_total.to_numpy(),
+        "Total Revenue Trend",
+        {"x": "Year", "y": "Amount (in Crores)"}
+    )
+
+def category_trend_figure(window, category):
+    """Return the trend lines of a category's largest entities (in the latest year) across the window"""
+    label_col, value_col = TABLE_COLUMNS[category]
+    top_labels = window.pivots[category][label_col].head(TOP_ENTITIES)
+    long_df = window.long(category)
+
+    fig = px.line(
+        long_df[long_df[label_col].isin(top_labels)],
+        x='Year',
+        y=value_col,
+        color=label_col,
+        markers=True,
+        title=f"{CATEGORY_TITLES[category]} Trend (Top {min(TOP_ENTITIES, len(top_labels))})",
+        height=500
+    )
+    fig.update_layout(**TITLE_FONTS, legend_title_font_size=16)
+    return fig
+
+def movers_figure(window, category):
+    """Return the bar chart of a category's 5 fastest growing entities by CAGR over the window"""
+    label_col = TABLE_COLUMNS[category][0]
+    movers = window.pivots[category][[label_col, 'CAGR (%)']]
+    movers = movers[np.isfinite(movers['CAGR (%)'])].nlargest(5, 'CAGR (%)')
+
+    fig = px.bar(
+        movers,
+        x=label_col,
+        y='CAGR (%)',
+        color='CAGR (%)',
+        color_continuous_scale='Greens',
+        title=f"Top 5 by CAGR ({window.start_year} to {window.end_year})",
+        height=400
+    )
+    fig.update_layout(**TITLE_FONTS)
+    return fig
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from utils import HIERARCHY_LEVELS, TABLE_COLUMNS
+from search import SearchIndex, SEARCH_LIMIT
+
+# Label of rows that have no value at a lower level (e.g. a ministry total without departments)
+UNSPECIFIED_LABEL = '(Unspecified)'
+
+class BudgetHierarchy:
+    """
+    Ministry -> department -> scheme hierarchy of one year's allocations
+
+    Rows are sorted by the integer codes of their path (see
+    utils.encode_dimensions) so every node covers a contiguous run of leaf rows
+    (a nested-set layout), and a prefix sum over the leaf values
+    makes any node's subtotal a difference of two entries. Nodes of each
+    level are stored in path order, so the children of a node are also a
+    contiguous run of the next level; expanding a node touches only them.
+    """
+
+    def __init__(self, frame, levels, value_col):
+        self.levels = tuple(levels)
+        codes = {}
+        # Label of every code per level; missing labels (code -1) read as the last entry
+        self.names = {}
+        for level in self.levels:
+            column = frame[level]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                codes[level], categories = column.cat.codes.to_numpy(), column.cat.categories
+            else:
+                codes[level], categories = pd.factorize(column)
+            self.names[level] = np.append(np.asarray(categories).astype(str), UNSPECIFIED_LABEL)
+        values = pd.to_numeric(frame[value_col], errors='coerce').fillna(0).to_numpy(dtype=float)
+
+        # Sort leaf rows by path codes (last key is primary for lexsort)
+        order = np.lexsort([codes[level] for level in reversed(self.levels)])
+        codes = {level: column[order] for level, column in codes.items()}
+        self.prefix = np.concatenate(([0.0], np.cumsum(values[order])))
+        self.leaf_codes = codes
+        self._leaf_search = None
+
+        # Node boundaries per level: a node starts where its path differs from the previous row
+        self.starts = []
+        self.ends = []
+        self.labels = []
+        self.node_index = {}
+        changed = np.zeros(len(order), dtype=bool)
+        if len(order):
+            changed[0] = True
+        for depth, level in enumerate(self.levels):
+            column = codes[level]
+            changed[1:] |= column[1:] != column[:-1]
+            starts = np.flatnonzero(changed)
+            ends = np.append(starts[1:], len(order))
+            self.starts.append(starts)
+            self.ends.append(ends)
+            self.labels.append(self.leaf_labels(level, starts))
+            # Plain Python strings hash much faster than NumPy string scalars
+            paths = zip(*[self.leaf_labels(self.levels[d], starts).tolist() for d in range(depth + 1)])
+            self.node_index.update(zip(paths, ((depth, i) for i in range(len(starts)))))
+
+        # Child ranges: the children of node i at depth d are nodes
+        # child_starts[d][i]..child_ends[d][i] at depth d + 1
+        self.child_starts = []
+        self.child_ends = []
+        for depth in range(len(self.levels) - 1):
+            child_rows = self.starts[depth + 1]
+            self.child_starts.append(np.searchsorted(child_rows, self.starts[depth]))
+            self.child_ends.append(np.searchsorted(child_rows, self.ends[depth]))
+
+    @classmethod
+    def from_frame(cls, frame, value_col=TABLE_COLUMNS['ministry_allocation'][1]):
+        """Build the hierarchy from a ministry_allocation frame, using the levels it has"""
+        levels = [level for level in HIERARCHY_LEVELS if level in frame.columns]
+        return cls(frame, levels, value_col)
+
+    @property
+    def total(self):
+        """Total of every leaf row"""
+        return self.prefix[-1]
+
+    def subtotal(self, path):
+        """Return the subtotal of the node at path, e.g. ('Defense', 'Army'), in constant time"""
+        if not path:
+            return self.total
+        depth, i = self.node_index[tuple(path)]
+        return self.prefix[self.ends[depth][i]] - self.prefix[self.starts[depth][i]]
+
+    def has_children(self, path):
+        """Check whether the node at path can be expanded"""
+        return len(path) < len(self.levels)
+
+    def children(self, path=()):
+        """
+        Return the children of the node at path (the ministries for the root)
+        as a frame of label, value and share of the node, largest first
+        """
+        path = tuple(path)
+        depth = len(path)
+        if depth == 0:
+            first, last = 0, len(self.starts[0]) if self.levels else 0
+        else:
+            parent_depth, i = self.node_index[path]
+            first, last = self.child_starts[parent_depth][i], self.child_ends[parent_depth][i]
+
+        level = self.levels[depth]
+        starts = self.starts[depth][first:last]
+        ends = self.ends[depth][first:last]
+        values = self.prefix[ends] - self.prefix[starts]
+        parent_total = self.subtotal(path)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = values / parent_total * 100
+
+        children = pd.DataFrame({
+            level: self.labels[depth][first:last],
+            'Allocation (in Crores)': values,
+            'Share (%)': shares
+        })
+        return children.iloc[np.argsort(-values, kind='stable')].reset_index(drop=True)
+
+    def leaf_labels(self, level, rows=slice(None)):
+        """Return the labels at one level of the given leaf rows (default: every leaf row)"""
+        return self.names[level][self.leaf_codes[level][rows]]
+
+    @property
+    def leaf_search(self):
+        """Name search over the lowest level (schemes), in leaf row order, built on first use"""
+        if self._leaf_search is None:
+            self._leaf_search = SearchIndex(self.leaf_labels(self.levels[-1])) if self.levels else SearchIndex([])
+        return self._leaf_search
+
+    def find(self, query, limit=SEARCH_LIMIT):
+        """
+        Return the leaf rows (e.g. schemes) whose name matches query, best match
+        first, as a frame of their full path and allocation
+        """
+        rows = self.leaf_search.search_positions(query, limit)
+        matches = pd.DataFrame({level: self.leaf_labels(level, rows) for level in self.levels})
+        matches['Allocation (in Crores)'] = self.prefix[rows + 1] - self.prefix[rows]
+        return matches
+
+def budget_hierarchy(dataset, year):
+    """Return the BudgetHierarchy of one year, built once per dataset"""
+    return dataset.memo(('hierarchy', year), lambda: BudgetHierarchy.from_frame(dataset[year]['ministry_allocation']))
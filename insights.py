@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+from utils import format_currency
+from hierarchy import BudgetHierarchy, budget_hierarchy
+
+class YearInsights:
+    """
+    Summary statistics and insight messages of one year of budget data
+
+    stats holds the numbers the messages are built from (top ministry, total
+    budget, capital and revenue expenditure shares, ...); messages is the
+    list of sentences shown in the views.
+    """
+
+    def __init__(self, year, stats, messages):
+        self.year = year
+        self.stats = stats
+        self.messages = messages
+
+def compute_year_insights(year, year_data, ministries=None):
+    """
+    Compute the statistics and insight messages of one year in a single pass over its tables
+
+    ministries is the year's ministry rollup (BudgetHierarchy.children(), largest
+    first); it is built from the ministry_allocation table when not given.
+    """
+    stats = {}
+    messages = []
+
+    try:
+        # Budget allocation insights, per ministry rather than per department or scheme row
+        if ministries is None:
+            ministries = BudgetHierarchy.from_frame(year_data['ministry_allocation']).children()
+        allocations = ministries['Allocation (in Crores)'].to_numpy(dtype=float)
+        stats['top_ministry'] = ministries['Ministry'].iloc[0]
+        stats['top_allocation'] = allocations[0]
+        stats['ministry_total'] = np.nansum(allocations)
+        messages.append(f"The {stats['top_ministry']} ministry has the highest allocation at {format_currency(stats['top_allocation'] * 1e7)}.")
+
+        # Budget summary insights
+        summary = year_data['budget_summary']
+        stats['total_budget'] = summary['Total Budget']
+        stats['fiscal_deficit_pct'] = summary['Fiscal Deficit %']
+        messages.append(f"The total budget for {year} is {format_currency(stats['total_budget'] * 1e7)}.")
+        messages.append(f"The fiscal deficit is {stats['fiscal_deficit_pct']}% of GDP.")
+
+        # Spending type insights, both amounts from one lookup table
+        if 'spending_type' in year_data:
+            spending_df = year_data['spending_type']
+            amounts = pd.Series(spending_df['Amount (in Crores)'].to_numpy(), index=spending_df['Type'].to_numpy())
+            amounts = amounts[~amounts.index.duplicated()]
+            capital_exp = amounts['Capital Expenditure']
+            revenue_exp = amounts['Revenue Expenditure']
+            total_exp = capital_exp + revenue_exp
+
+            stats['capital_expenditure'] = capital_exp
+            stats['revenue_expenditure'] = revenue_exp
+            stats['capital_share'] = (capital_exp / total_exp) * 100
+            stats['revenue_share'] = (revenue_exp / total_exp) * 100
+            messages.append(f"Capital expenditure accounts for {stats['capital_share']:.1f}% of total expenditure.")
+            messages.append(f"Revenue expenditure accounts for {stats['revenue_share']:.1f}% of total expenditure.")
+
+    except Exception as e:
+        messages.append(f"Could not generate insights due to data structure issues: {e}")
+
+    return YearInsights(year, stats, messages)
+
+def year_insights(dataset, year):
+    """Return the YearInsights of one year of a BudgetDataset, computed once per dataset"""
+    return dataset.memo(('insights', year), lambda: compute_year_insights(
+        year, dataset[year], budget_hierarchy(dataset, year).children()
+    ))
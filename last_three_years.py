@@ -1,167 +1,114 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import numpy as np
 import sys
 import os
 
 # Add parent directory to path to import utils.py
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils import load_data, create_bar_chart, create_line_chart, format_currency, generate_insights
+from layout import show_sections, search_picker
+from utils import format_table
+from figures import (
+    summary_trend_figures, entity_trend_figure, year_bar_figure, sector_stack_figure,
+    revenue_area_figure, total_revenue_figure
+)
+from comparison import compare_window
+from hierarchy import budget_hierarchy
 
-def show(uploaded_file=None, use_sample=True):
+# Budget summary metrics shown in the trends section
+SUMMARY_TRENDS = ['Total Budget', 'Fiscal Deficit', 'Fiscal Deficit %', 'GDP']
+
+def show(data):
     """Display the Last 3 Years view of budget data"""
     # Page header
     st.markdown('<div class="main-header">Last 3 Years\' Budget</div>', unsafe_allow_html=True)
     
-    # Load data
-    data = load_data(uploaded_file, use_sample)
-    
     if data is None:
         st.error("No data available. Please upload a file or use sample data.")
         return
     
     # Get the last 3 years (latest 3 years in the data)
-    years = sorted(data.keys(), reverse=True)
+    years = data.years
     if len(years) < 3:
         st.warning(f"Data for at least 3 years is required for this view. Currently only data for {len(years)} year(s) is available.")
         return
     
-    selected_years = years[:3]
+    selected_years = list(data.latest(3))
+    window = compare_window(data, selected_years)
     
     # Display selected years in the header
     st.markdown(f'<div class="sub-header">Budget Analysis: {selected_years[0]} - {selected_years[2]}</div>', unsafe_allow_html=True)
     
-    # Create tabs for different sections
-    tabs = st.tabs(["Budget Trends", "Ministry Allocations", "Sector Trends", "Revenue Trends"])
-    
     # Tab 1: Budget Trends
-    with tabs[0]:
+    def budget_trends():
         st.markdown('<div class="section-header">Budget Summary Trends</div>', unsafe_allow_html=True)
         
-        # Create dataframe for budget summary
-        summary_data = {
-            'Year': selected_years,
-            'Total Budget': [data[year]['budget_summary']['Total Budget'] for year in selected_years],
-            'Fiscal Deficit': [data[year]['budget_summary']['Fiscal Deficit'] for year in selected_years],
-            'Fiscal Deficit %': [data[year]['budget_summary']['Fiscal Deficit %'] for year in selected_years],
-            'GDP': [data[year]['budget_summary']['GDP'] for year in selected_years]
-        }
-        
-        summary_df = pd.DataFrame(summary_data)
+        # Budget summary from the shared year-window engine; a metric missing
+        # from the window shows as empty instead of failing
+        trend_summary = window.summary.reindex(columns=SUMMARY_TRENDS)
+        summary_df = trend_summary.iloc[::-1].reset_index()
         
         # Display summary table
         st.dataframe(
-            summary_df.style.format({
-                'Total Budget': lambda x: format_currency(x * 1e7),
-                'Fiscal Deficit': lambda x: format_currency(x * 1e7),
-                'Fiscal Deficit %': '{:.2f}%',
-                'GDP': lambda x: format_currency(x * 1e7)
-            }),
+            format_table(
+                summary_df,
+                currency_columns=['Total Budget', 'Fiscal Deficit', 'GDP'],
+                percent_columns=['Fiscal Deficit %']
+            ),
             use_container_width=True,
             hide_index=True
         )
         
-        # Line charts for key metrics
+        # Line charts for key metrics: Total Budget and GDP, then Fiscal Deficit and Fiscal Deficit %
+        trend_figures = summary_trend_figures(trend_summary, ['Total Budget', 'GDP', 'Fiscal Deficit', 'Fiscal Deficit %'])
         col1, col2 = st.columns(2)
         
         with col1:
-            # Total Budget Trend
-            budget_trend = summary_df.sort_values('Year')
-            budget_fig = create_line_chart(
-                budget_trend['Year'],
-                budget_trend['Total Budget'],
-                "Total Budget Trend",
-                {"x": "Year", "y": "Budget (in Crores)"}
-            )
-            st.plotly_chart(budget_fig, use_container_width=True)
-            
-            # GDP Trend
-            gdp_fig = create_line_chart(
-                budget_trend['Year'],
-                budget_trend['GDP'],
-                "GDP Trend",
-                {"x": "Year", "y": "GDP (in Crores)"}
-            )
-            st.plotly_chart(gdp_fig, use_container_width=True)
+            for _, trend_fig in trend_figures[:2]:
+                st.plotly_chart(trend_fig, use_container_width=True)
         
         with col2:
-            # Fiscal Deficit Trend
-            deficit_fig = create_line_chart(
-                budget_trend['Year'],
-                budget_trend['Fiscal Deficit'],
-                "Fiscal Deficit Trend",
-                {"x": "Year", "y": "Deficit (in Crores)"}
-            )
-            st.plotly_chart(deficit_fig, use_container_width=True)
-            
-            # Fiscal Deficit % Trend
-            deficit_pct_fig = create_line_chart(
-                budget_trend['Year'],
-                budget_trend['Fiscal Deficit %'],
-                "Fiscal Deficit % of GDP Trend",
-                {"x": "Year", "y": "Deficit (% of GDP)"}
-            )
-            st.plotly_chart(deficit_pct_fig, use_container_width=True)
+            for _, trend_fig in trend_figures[2:]:
+                st.plotly_chart(trend_fig, use_container_width=True)
         
         # Overall growth statistics
         st.markdown('<div class="section-header">Overall Growth</div>', unsafe_allow_html=True)
         
-        # Calculate CAGR (Compound Annual Growth Rate)
-        years_diff = selected_years[0] - selected_years[-1]
-        budget_cagr = ((summary_df.iloc[0]['Total Budget'] / summary_df.iloc[-1]['Total Budget']) ** (1/years_diff) - 1) * 100
-        gdp_cagr = ((summary_df.iloc[0]['GDP'] / summary_df.iloc[-1]['GDP']) ** (1/years_diff) - 1) * 100
+        # Growth and CAGR (Compound Annual Growth Rate) over the window, precomputed by the engine
+        growth = window.summary_growth.set_index('Metric').reindex(['Total Budget', 'GDP'])
         
         col1, col2 = st.columns(2)
         
         with col1:
-            st.metric("Budget CAGR", f"{budget_cagr:.2f}%")
-            st.metric("Total Budget Growth", 
-                    f"{((summary_df.iloc[0]['Total Budget'] - summary_df.iloc[-1]['Total Budget']) / summary_df.iloc[-1]['Total Budget'] * 100):.2f}%")
+            st.metric("Budget CAGR", f"{growth.loc['Total Budget', 'CAGR (%)']:.2f}%")
+            st.metric("Total Budget Growth", f"{growth.loc['Total Budget', 'Change (%)']:.2f}%")
         
         with col2:
-            st.metric("GDP CAGR", f"{gdp_cagr:.2f}%")
-            st.metric("Total GDP Growth", 
-                    f"{((summary_df.iloc[0]['GDP'] - summary_df.iloc[-1]['GDP']) / summary_df.iloc[-1]['GDP'] * 100):.2f}%")
+            st.metric("GDP CAGR", f"{growth.loc['GDP', 'CAGR (%)']:.2f}%")
+            st.metric("Total GDP Growth", f"{growth.loc['GDP', 'Change (%)']:.2f}%")
     
     # Tab 2: Ministry Allocations
-    with tabs[1]:
+    def ministry_allocations():
         st.markdown('<div class="section-header">Ministry Allocation Trends</div>', unsafe_allow_html=True)
         
-        # Combine ministry data for all years
-        ministry_data = []
-        for year in selected_years:
-            year_df = data[year]['ministry_allocation']
-            year_df['Year'] = year
-            ministry_data.append(year_df)
-        
-        all_ministry_df = pd.concat(ministry_data)
-        
         # Select ministry for detailed analysis
-        all_ministries = sorted(all_ministry_df['Ministry'].unique())
-        selected_ministry = st.selectbox("Select a Ministry for Detailed Analysis", all_ministries)
-        
-        # Filter for selected ministry
-        ministry_trend = all_ministry_df[all_ministry_df['Ministry'] == selected_ministry]
+        selected_ministry = search_picker(
+            "Select a Ministry for Detailed Analysis",
+            data.search['ministry_allocation'],
+            key='last_three_years_ministry',
+            mask=data.cube.present_in('ministry_allocation', selected_years)
+        )
         
-        # Sort by year
-        ministry_trend = ministry_trend.sort_values('Year')
+        # Slice the selected ministry's trend out of the cube (chronological order)
+        ministry_years, ministry_values = data.cube.series('ministry_allocation', selected_ministry, selected_years[-1], selected_years[0])
         
         # Display trend for selected ministry
         st.subheader(f"{selected_ministry} Budget Allocation Trend")
         
-        ministry_fig = create_line_chart(
-            ministry_trend['Year'],
-            ministry_trend['Allocation (in Crores)'],
-            f"{selected_ministry} Budget Allocation Trend",
-            {"x": "Year", "y": "Allocation (in Crores)"}
-        )
+        ministry_fig = entity_trend_figure('ministry_allocation', selected_ministry, ministry_years, ministry_values)
         st.plotly_chart(ministry_fig, use_container_width=True)
         
-        # Calculate growth
-        first_allocation = ministry_trend.iloc[-1]['Allocation (in Crores)']
-        last_allocation = ministry_trend.iloc[0]['Allocation (in Crores)']
+        # Calculate growth from the earliest to the latest selected year
+        first_allocation = ministry_values[0]
+        last_allocation = ministry_values[-1]
         growth_pct = ((last_allocation - first_allocation) / first_allocation) * 100
         
         st.metric(
@@ -172,56 +119,38 @@ def show(uploaded_file=None, use_sample=True):
         # Show bar chart for all ministries for the most recent year
         st.subheader(f"All Ministries - {selected_years[0]} Budget Allocation")
         
-        latest_ministries = data[selected_years[0]]['ministry_allocation'].sort_values('Allocation (in Crores)', ascending=False)
+        # One row per ministry, rolled up from its departments and schemes
+        latest_ministries = budget_hierarchy(data, selected_years[0]).children()
         
-        ministry_bar = create_bar_chart(
-            latest_ministries,
-            'Ministry',
-            'Allocation (in Crores)',
-            f"Ministry-wise Budget Allocation ({selected_years[0]})",
-            horizontal=True
-        )
+        ministry_bar = year_bar_figure('ministry_allocation', latest_ministries, selected_years[0])
         st.plotly_chart(ministry_bar, use_container_width=True)
     
     # Tab 3: Sector Trends
-    with tabs[2]:
+    def sector_trends():
         st.markdown('<div class="section-header">Sector Expenditure Trends</div>', unsafe_allow_html=True)
         
         # Check if sector data is available for all years
-        if all('sector_expenditure' in data[year] for year in selected_years):
-            # Combine sector data for all years
-            sector_data = []
-            for year in selected_years:
-                year_df = data[year]['sector_expenditure']
-                year_df['Year'] = year
-                sector_data.append(year_df)
-            
-            all_sector_df = pd.concat(sector_data)
-            
+        if data.has_table('sector_expenditure', selected_years):
             # Select sector for detailed analysis
-            all_sectors = sorted(all_sector_df['Sector'].unique())
-            selected_sector = st.selectbox("Select a Sector for Detailed Analysis", all_sectors)
-            
-            # Filter for selected sector
-            sector_trend = all_sector_df[all_sector_df['Sector'] == selected_sector]
+            selected_sector = search_picker(
+                "Select a Sector for Detailed Analysis",
+                data.search['sector_expenditure'],
+                key='last_three_years_sector',
+                mask=data.cube.present_in('sector_expenditure', selected_years)
+            )
             
-            # Sort by year
-            sector_trend = sector_trend.sort_values('Year')
+            # Slice the selected sector's trend out of the cube (chronological order)
+            sector_years, sector_values = data.cube.series('sector_expenditure', selected_sector, selected_years[-1], selected_years[0])
             
             # Display trend for selected sector
             st.subheader(f"{selected_sector} Expenditure Trend")
             
-            sector_fig = create_line_chart(
-                sector_trend['Year'],
-                sector_trend['Expenditure (in Crores)'],
-                f"{selected_sector} Expenditure Trend",
-                {"x": "Year", "y": "Expenditure (in Crores)"}
-            )
+            sector_fig = entity_trend_figure('sector_expenditure', selected_sector, sector_years, sector_values)
             st.plotly_chart(sector_fig, use_container_width=True)
             
-            # Calculate growth
-            first_expenditure = sector_trend.iloc[-1]['Expenditure (in Crores)']
-            last_expenditure = sector_trend.iloc[0]['Expenditure (in Crores)']
+            # Calculate growth from the earliest to the latest selected year
+            first_expenditure = sector_values[0]
+            last_expenditure = sector_values[-1]
             growth_pct = ((last_expenditure - first_expenditure) / first_expenditure) * 100
             
             st.metric(
@@ -232,78 +161,37 @@ def show(uploaded_file=None, use_sample=True):
             # Compare all sectors across years
             st.subheader(f"Sector-wise Expenditure Comparison")
             
-            # Prepare data for stacked bar chart
-            sector_pivot = all_sector_df.pivot(index='Sector', columns='Year', values='Expenditure (in Crores)').reset_index()
-            sector_pivot = sector_pivot.fillna(0)
-            
-            # Convert to long format for Plotly
-            sector_long = sector_pivot.melt(
-                id_vars=['Sector'],
-                value_vars=selected_years,
-                var_name='Year',
-                value_name='Expenditure (in Crores)'
-            )
-            
-            # Create stacked bar chart
-            fig = px.bar(
-                sector_long, 
-                x='Year', 
-                y='Expenditure (in Crores)', 
-                color='Sector', 
-                title="Sector-wise Expenditure Across Years",
-                height=500
-            )
-            
-            fig.update_layout(
-                title_font_size=20,
-                xaxis_title_font_size=16,
-                yaxis_title_font_size=16,
-                legend_title_font_size=16
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            # Stacked bar chart from the engine's sector pivot
+            st.plotly_chart(sector_stack_figure(window), use_container_width=True)
         else:
             st.info("Sector-wise expenditure data not available for all selected years.")
     
     # Tab 4: Revenue Trends
-    with tabs[3]:
+    def revenue_trends():
         st.markdown('<div class="section-header">Revenue Source Trends</div>', unsafe_allow_html=True)
         
         # Check if revenue data is available for all years
-        if all('revenue_sources' in data[year] for year in selected_years):
-            # Combine revenue data for all years
-            revenue_data = []
-            for year in selected_years:
-                year_df = data[year]['revenue_sources']
-                year_df['Year'] = year
-                revenue_data.append(year_df)
-            
-            all_revenue_df = pd.concat(revenue_data)
-            
+        if data.has_table('revenue_sources', selected_years):
             # Select revenue source for detailed analysis
-            all_sources = sorted(all_revenue_df['Source'].unique())
-            selected_source = st.selectbox("Select a Revenue Source for Detailed Analysis", all_sources)
-            
-            # Filter for selected source
-            source_trend = all_revenue_df[all_revenue_df['Source'] == selected_source]
+            selected_source = search_picker(
+                "Select a Revenue Source for Detailed Analysis",
+                data.search['revenue_sources'],
+                key='last_three_years_source',
+                mask=data.cube.present_in('revenue_sources', selected_years)
+            )
             
-            # Sort by year
-            source_trend = source_trend.sort_values('Year')
+            # Slice the selected source's trend out of the cube (chronological order)
+            source_years, source_values = data.cube.series('revenue_sources', selected_source, selected_years[-1], selected_years[0])
             
             # Display trend for selected source
             st.subheader(f"{selected_source} Revenue Trend")
             
-            source_fig = create_line_chart(
-                source_trend['Year'],
-                source_trend['Amount (in Crores)'],
-                f"{selected_source} Revenue Trend",
-                {"x": "Year", "y": "Amount (in Crores)"}
-            )
+            source_fig = entity_trend_figure('revenue_sources', selected_source, source_years, source_values)
             st.plotly_chart(source_fig, use_container_width=True)
             
-            # Calculate growth
-            first_amount = source_trend.iloc[-1]['Amount (in Crores)']
-            last_amount = source_trend.iloc[0]['Amount (in Crores)']
+            # Calculate growth from the earliest to the latest selected year
+            first_amount = source_values[0]
+            last_amount = source_values[-1]
             growth_pct = ((last_amount - first_amount) / first_amount) * 100
             
             st.metric(
@@ -314,40 +202,19 @@ def show(uploaded_file=None, use_sample=True):
             # Area chart showing all revenue sources over time
             st.subheader(f"All Revenue Sources Over Time")
             
-            # Prepare data for area chart
-            all_revenue_df_sorted = all_revenue_df.sort_values(['Year', 'Source'])
-            
-            fig = px.area(
-                all_revenue_df_sorted, 
-                x='Year', 
-                y='Amount (in Crores)', 
-                color='Source', 
-                title="Revenue Sources Trend",
-                height=500
-            )
-            
-            fig.update_layout(
-                title_font_size=20,
-                xaxis_title_font_size=16,
-                yaxis_title_font_size=16,
-                legend_title_font_size=16
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Calculate total revenue for each year
-            yearly_total = all_revenue_df.groupby('Year')['Amount (in Crores)'].sum().reset_index()
-            yearly_total = yearly_total.sort_values('Year')
+            st.plotly_chart(revenue_area_figure(window), use_container_width=True)
             
             # Display total revenue trend
             st.subheader("Total Revenue Trend")
             
-            total_fig = create_line_chart(
-                yearly_total['Year'],
-                yearly_total['Amount (in Crores)'],
-                "Total Revenue Trend",
-                {"x": "Year", "y": "Amount (in Crores)"}
-            )
-            st.plotly_chart(total_fig, use_container_width=True)
+            st.plotly_chart(total_revenue_figure(window), use_container_width=True)
         else:
-            st.info("Revenue sources data not available for all selected years.")
\ No newline at end of file
+            st.info("Revenue sources data not available for all selected years.")
+    
+    # Render only the selected section (see layout.LAZY_SECTIONS)
+    show_sections([
+        ("Budget Trends", budget_trends),
+        ("Ministry Allocations", ministry_allocations),
+        ("Sector Trends", sector_trends),
+        ("Revenue Trends", revenue_trends)
+    ], key='last_three_years_section')
\ No newline at end of file
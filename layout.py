@@ -0,0 +1,142 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+from utils import format_table
+from search import SEARCH_LIMIT
+
+# Render only the active section of a view. st.tabs runs every tab body on each
+# rerun, so with this off every section's tables and figures are built every time.
+LAZY_SECTIONS = True
+
+def show_sections(sections, key, lazy=None):
+    """
+    Display a view's sections as tabs
+
+    sections is a list of (label, render function). In lazy mode the tabs are a
+    horizontal selector and only the selected section's function runs; otherwise
+    every section is rendered inside st.tabs.
+    """
+    if lazy is None:
+        lazy = LAZY_SECTIONS
+
+    labels = [label for label, _ in sections]
+
+    if lazy:
+        selected = st.radio("Section", labels, horizontal=True, key=key, label_visibility="collapsed")
+        dict(sections)[selected]()
+        return
+
+    tabs = st.tabs(labels)
+    for tab, (_, render) in zip(tabs, sections):
+        with tab:
+            render()
+
+# Rows per page in paginated tables
+TABLE_PAGE_SIZE = 50
+
+def show_paginated_table(df, key, label_column, currency_columns=(), percent_columns=(), sort_column=None, page_size=None):
+    """
+    Display a large table one page at a time
+
+    Filtering, sorting and top-K run on the server over the full frame; only the
+    rows of the visible page are formatted and sent to the browser.
+    """
+    page_size = page_size or TABLE_PAGE_SIZE
+    columns = list(df.columns)
+    if sort_column is None:
+        sort_column = currency_columns[0] if currency_columns else columns[0]
+
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        query = st.text_input(f"Filter {label_column}", key=f"{key}_filter")
+    with col2:
+        sort_column = st.selectbox("Sort by", columns, index=columns.index(sort_column), key=f"{key}_sort")
+    with col3:
+        descending = st.checkbox("Descending", value=True, key=f"{key}_descending")
+    with col4:
+        top_k = st.number_input("Top K (0 = all)", min_value=0, value=0, step=10, key=f"{key}_top_k")
+
+    rows = df
+    if query:
+        rows = rows[rows[label_column].astype(str).str.contains(query, case=False, regex=False)]
+    total = len(rows) if not top_k else min(top_k, len(rows))
+
+    page_count = max(1, -(-total // page_size))
+    # The page selector restarts at page 1 whenever filtering changes the page count
+    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1,
+                           key=f"{key}_page_{page_count}")
+    start = (page - 1) * page_size
+    end = min(start + page_size, total)
+
+    # Order only as many rows as the visible page needs
+    order = _leading_order(rows[sort_column], end, descending)
+    page_rows = rows.iloc[order[start:end]]
+
+    st.dataframe(
+        format_table(page_rows, currency_columns=currency_columns, percent_columns=percent_columns),
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption(f"Showing rows {start + 1 if total else 0}-{end} of {total}")
+
+def _leading_order(values, count, descending):
+    """
+    Return the positions of the first count values in sorted order
+    Numeric columns use a partial selection (np.argpartition) so only the leading
+    rows are fully sorted; other columns fall back to a full stable sort
+    """
+    if count <= 0:
+        return np.arange(0)
+    if not pd.api.types.is_numeric_dtype(values):
+        return np.argsort(values.astype(str).to_numpy(), kind='stable')[::-1 if descending else 1][:count]
+
+    keys = values.to_numpy(dtype=float)
+    keys = -keys if descending else keys
+    # Missing values sort last in both directions
+    keys = np.where(np.isnan(keys), np.inf, keys)
+    if count < len(keys):
+        leading = np.argpartition(keys, count - 1)[:count]
+    else:
+        leading = np.arange(len(keys))
+    return leading[np.argsort(keys[leading], kind='stable')]
+
+def search_picker(label, index, key, mask=None, limit=None):
+    """
+    Pick one name from a search index (see search.SearchIndex)
+
+    A search box narrows the choices to the best matches, so only those are
+    sent to the browser instead of every name. mask limits the names offered.
+    """
+    limit = limit or SEARCH_LIMIT
+    query = st.text_input(f"Search: {label}", key=f"{key}_query", placeholder="Type part of a name")
+    matches = index.search(query, limit, mask)
+    if query and not matches:
+        st.caption(f"No names match '{query}'; showing all.")
+        matches = index.search('', limit, mask)
+    elif len(matches) == limit:
+        st.caption(f"Showing the top {limit} matches of {len(index)} names; refine the search to narrow them down.")
+    return st.selectbox(label, matches, key=f"{key}_choice")
+
+def show_precompute_progress(job):
+    """
+    Show the progress of a background precompute job (see precompute.PrecomputeJob)
+    in the sidebar; on Streamlit versions with fragments it refreshes itself
+    until the job is done, without rerunning the page
+    """
+    # A finished job registers no fragment, so nothing keeps polling
+    if job.done:
+        return
+    
+    def render():
+        if job.done:
+            if fragment:
+                # Rerun the page once, which drops the polling fragment
+                st.rerun()
+            return
+        st.progress(job.progress, text=f"Preparing views: {job.current or 'starting'}...")
+    
+    fragment = hasattr(st, 'fragment')
+    if fragment:
+        render = st.fragment(run_every=1)(render)
+    with st.sidebar:
+        render()
@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+from comparison import compare_window, year_deltas
+from hierarchy import budget_hierarchy
+from insights import year_insights
+
+# Number of recent datasets whose precompute jobs are kept
+PRECOMPUTE_JOBS = 4
+
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+
+def precompute_tasks(dataset):
+    """
+    Return the (label, function) tasks that build every derived table the views use
+
+    Each function stores its result in the dataset's memo, where the views find it.
+    """
+    years = list(dataset.years)
+    # Shared by the comparisons and the entity pickers, so built first
+    tasks = [
+        ("Trend cube", lambda: dataset.cube),
+        ("Search indexes", lambda: dataset.search)
+    ]
+    if len(years) >= 2:
+        tasks.append(("Year-over-year changes", lambda: year_deltas(dataset)))
+        # Windows of the Last 2 Years, Last 3 Years and Multi-Year Comparison (full range) views
+        for count in (2, 3):
+            if len(years) >= count:
+                tasks.append((f"Last {count} years comparison", lambda count=count: compare_window(dataset, years[:count])))
+        if len(years) > 3:
+            tasks.append(("Multi-year comparison", lambda: compare_window(dataset, years)))
+    # Drill-down hierarchies, latest year first
+    for year in years:
+        tasks.append((f"{year} drill-down", lambda year=year: budget_hierarchy(dataset, year)))
+    # Insight messages of every year, from the drill-down rollups above
+    for year in years:
+        tasks.append((f"{year} insights", lambda year=year: year_insights(dataset, year)))
+    return tasks
+
+class PrecomputeJob:
+    """
+    Background thread that runs a dataset's precompute tasks one after another
+
+    The views keep working while it runs: an artifact that is not built yet is
+    built on demand, and one that is being built is waited for (see
+    BudgetDataset.memo). A thread rather than a process pool is used because the
+    results must land in the dataset object of this process; the heavy parts
+    are numpy and pandas operations.
+    """
+
+    def __init__(self, dataset):
+        self.tasks = precompute_tasks(dataset)
+        self.total = len(self.tasks)
+        self.completed = 0
+        self.current = None
+        self.errors = []
+        self._thread = threading.Thread(target=self._run, name='budget-precompute', daemon=True)
+
+    def start(self):
+        """Start the worker thread"""
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for label, task in self.tasks:
+            self.current = label
+            try:
+                task()
+            except Exception as e:
+                # The view that needs the artifact will retry and report the error itself
+                print(f"Error precomputing {label}: {e}")
+                self.errors.append((label, str(e)))
+            self.completed += 1
+        self.current = None
+
+    @property
+    def progress(self):
+        """Fraction of the tasks finished"""
+        return self.completed / self.total if self.total else 1.0
+
+    @property
+    def done(self):
+        """Check whether every task has finished"""
+        return self.completed >= self.total
+
+    def wait(self, timeout=None):
+        """Block until the job finishes or timeout seconds pass"""
+        self._thread.join(timeout)
+        return self.done
+
+def precompute(dataset):
+    """Return the precompute job of a dataset, starting it on first call"""
+    key = id(dataset)
+    with _jobs_lock:
+        entry = _jobs.get(key)
+        # The entry holds the dataset, so its id cannot be reused while the entry exists
+        if entry is not None and entry[0] is dataset:
+            _jobs.move_to_end(key)
+            return entry[1]
+        job = PrecomputeJob(dataset)
+        _jobs[key] = (dataset, job)
+        while len(_jobs) > PRECOMPUTE_JOBS:
+            _jobs.popitem(last=False)
+    return job.start()
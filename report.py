@@ -0,0 +1,224 @@
+"""
+Headless report generator
+
+Builds the figures and tables of the This Year, Last 2 Years, Last 3 Years and
+Multi-Year Comparison views for every year and every comparison window, without
+Streamlit, and writes them to an output directory with an index.html linking
+everything.
+Figures are rendered in parallel in a process pool.
+
+    python report.py --output reports
+    python report.py --input budget.csv --format png --workers 8
+"""
+import argparse
+import html
+import importlib.util
+import os
+import sys
+import pandas as pd
+import plotly.io as pio
+from utils import TABLE_COLUMNS, format_table, run_in_pool
+from figures import (
+    CATEGORY_TITLES, YEAR_CHARTS, year_figures, capital_gauge_figure, drilldown_figure,
+    summary_trend_figures, comparison_bar_figure, top_increase_figure, sector_stack_figure,
+    revenue_area_figure, total_revenue_figure, category_trend_figure, movers_figure
+)
+from dataset import get_dataset, get_batch_dataset
+from comparison import compare_window, year_deltas
+from hierarchy import budget_hierarchy
+from insights import year_insights
+
+# Output formats; image formats are rendered with kaleido
+REPORT_FORMATS = ['html', 'png', 'svg', 'pdf']
+# Worker processes rendering figures (None = one per CPU)
+REPORT_MAX_WORKERS = None
+
+def report_windows(dataset):
+    """Return every comparison window: each run of 2 and 3 consecutive years, and the full range"""
+    chronological = list(dataset.years[::-1])
+    windows = []
+    for size in (2, 3):
+        for start in range(len(chronological) - size + 1):
+            windows.append(tuple(chronological[start:start + size]))
+    if len(chronological) > 3:
+        windows.append(tuple(chronological))
+    return windows
+
+def year_report(dataset, year):
+    """Return the figures, tables and insights of one year, as in the This Year view"""
+    year_data = dataset[year]
+    hierarchy = budget_hierarchy(dataset, year)
+    figures = []
+    tables = []
+
+    for category in YEAR_CHARTS:
+        if category not in year_data:
+            continue
+        value_col = TABLE_COLUMNS[category][1]
+        if category == 'ministry_allocation':
+            # One row per ministry, rolled up from its departments and schemes
+            frame = hierarchy.children()
+        else:
+            frame = year_data[category].sort_values(value_col, ascending=False)
+        figures.extend(year_figures(category, frame, year))
+        tables.append((CATEGORY_TITLES[category], format_table(frame, currency_columns=[value_col])))
+
+    if 'spending_type' in year_data:
+        figures.append(("capital-share", capital_gauge_figure(year_data['spending_type'])))
+    figures.append(("drill-down", drilldown_figure(hierarchy, year)))
+
+    return figures, tables, year_insights(dataset, year).messages
+
+def window_report(dataset, years):
+    """
+    Return the figures and tables of one comparison window, as in the view that
+    shows it: Last 2 Years for 2 years, Last 3 Years for 3 and Multi-Year Comparison
+    for longer windows
+    """
+    window = compare_window(dataset, years)
+    figures = []
+    tables = [("Overall Growth", window.summary_growth)]
+    categories = [
+        category for category in TABLE_COLUMNS
+        if window.has_category(category) and dataset.has_table(category, years)
+    ]
+
+    if len(years) == 2:
+        deltas = year_deltas(dataset)
+        figures.extend(summary_trend_figures(window.summary.reindex(columns=['Total Budget', 'Fiscal Deficit'])))
+        for category in categories:
+            figures.append((f"{category}-comparison", comparison_bar_figure(window, category)))
+        if 'ministry_allocation' in categories:
+            figures.append(("ministry-increase", top_increase_figure(
+                deltas.table('ministry_allocation', window.end_year), window.start_year, window.end_year
+            )))
+    elif len(years) == 3:
+        figures.extend(summary_trend_figures(window.summary.reindex(columns=['Total Budget', 'GDP', 'Fiscal Deficit', 'Fiscal Deficit %'])))
+        if 'sector_expenditure' in categories:
+            figures.append(("sector-stack", sector_stack_figure(window)))
+        if 'revenue_sources' in categories:
+            figures.append(("revenue-area", revenue_area_figure(window)))
+            figures.append(("revenue-total", total_revenue_figure(window)))
+    else:
+        figures.extend(summary_trend_figures(window.summary))
+        for category in categories:
+            figures.append((f"{category}-trend", category_trend_figure(window, category)))
+            figures.append((f"{category}-movers", movers_figure(window, category)))
+
+    for category in categories:
+        label_col, value_col = TABLE_COLUMNS[category]
+        title = CATEGORY_TITLES[category]
+        if len(years) == 2:
+            table = deltas.table(category, window.end_year)
+            columns = [label_col, f'{value_col} ({window.end_year})', f'{value_col} ({window.start_year})', 'Change', 'Change (%)', 'Share Change (pp)']
+            tables.append((title, format_table(table[columns], currency_columns=columns[1:4], percent_columns=['Change (%)'])))
+        else:
+            pivot = window.pivots[category].rename(columns={year: str(year) for year in window.years})
+            tables.append((title, format_table(
+                pivot, currency_columns=[str(year) for year in window.years], percent_columns=['Change (%)', 'CAGR (%)']
+            )))
+
+    return figures, tables
+
+def render_figure(path, figure_json, fmt):
+    """Write one figure given as JSON to path (runs in a worker process)"""
+    fig = pio.from_json(figure_json, skip_invalid=True)
+    if fmt == 'html':
+        fig.write_html(path, include_plotlyjs='cdn', full_html=True)
+    else:
+        fig.write_image(path, format=fmt)
+    return path
+
+def render_figures(jobs, fmt, max_workers=REPORT_MAX_WORKERS):
+    """Render (path, figure) jobs in a process pool, sequentially when the pool is unavailable"""
+    payloads = [(path, fig.to_json(), fmt) for path, fig in jobs]
+    if not payloads:
+        return
+
+    def progress(fraction):
+        print(f"\rRendered {round(fraction * len(payloads))}/{len(payloads)} figures", end='', flush=True)
+
+    run_in_pool(render_figure, payloads, max_workers, label="Rendering", progress=progress)
+    print()
+
+def write_report(dataset, output, fmt='html', max_workers=REPORT_MAX_WORKERS):
+    """Build the report of every year and comparison window into output; return the index path"""
+    os.makedirs(output, exist_ok=True)
+    jobs = []
+    sections = []
+
+    def add_section(name, title, figures, tables, insights=()):
+        folder = os.path.join(output, name)
+        os.makedirs(folder, exist_ok=True)
+        links = []
+        for figure_name, fig in figures:
+            filename = f"{_slug(figure_name)}.{fmt}"
+            jobs.append((os.path.join(folder, filename), fig))
+            links.append(f'<li><a href="{name}/{filename}">{html.escape(fig.layout.title.text or figure_name)}</a></li>')
+        body = [f"<h2>{html.escape(title)}</h2>"]
+        if insights:
+            body.append("<ul>" + "".join(f"<li>{html.escape(insight)}</li>" for insight in insights) + "</ul>")
+        body.append("<h3>Figures</h3><ul>" + "".join(links) + "</ul>")
+        for table_title, table in tables:
+            body.append(f"<h3>{html.escape(table_title)}</h3>" + _table_html(table))
+        sections.append("\n".join(body))
+
+    for year in dataset.years:
+        figures, tables, insights = year_report(dataset, year)
+        add_section(f"year-{year}", f"Budget {year}", figures, tables, insights)
+    for years in report_windows(dataset):
+        figures, tables = window_report(dataset, years)
+        add_section(f"window-{years[0]}-{years[-1]}", f"Budget Comparison: {years[0]} - {years[-1]}", figures, tables)
+
+    render_figures(jobs, fmt, max_workers)
+
+    index = os.path.join(output, 'index.html')
+    with open(index, 'w', encoding='utf-8') as f:
+        f.write("<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Wallet of India - Budget Report</title></head><body>\n")
+        f.write("<h1>Wallet of India - Budget Report</h1>\n")
+        f.write("\n<hr>\n".join(sections))
+        f.write("\n</body></html>\n")
+    return index
+
+def load_report_dataset(source):
+    """Load the dataset of a CSV/Excel file, a directory or zip of files, or the sample data (None)"""
+    if source is None:
+        return get_dataset(None, use_sample=True)
+    if os.path.isdir(source) or source.lower().endswith('.zip'):
+        return get_batch_dataset(source)
+    with open(source, 'rb') as f:
+        return get_dataset(f, use_sample=False)
+
+def _table_html(table):
+    """Return the HTML of a table (a DataFrame or a format_table Styler) without its index"""
+    if isinstance(table, pd.DataFrame):
+        return table.to_html(index=False, border=0)
+    return table.hide(axis='index').to_html()
+
+def _slug(name):
+    """Make a figure name safe for a file name"""
+    name = name.lower().replace(' %', ' pct').replace('%', 'pct')
+    return ''.join(c if c.isalnum() or c in '-_' else '-' for c in name).strip('-')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write static budget reports for every year and comparison window.")
+    parser.add_argument('--input', help="CSV/Excel file, or a directory or zip of files (default: sample data)")
+    parser.add_argument('--output', default='reports', help="output directory (default: reports)")
+    parser.add_argument('--format', default='html', choices=REPORT_FORMATS, help="figure format (default: html)")
+    parser.add_argument('--workers', type=int, default=REPORT_MAX_WORKERS, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    if args.format != 'html' and importlib.util.find_spec('kaleido') is None:
+        parser.error(f"--format {args.format} needs the kaleido package (pip install kaleido)")
+
+    dataset = load_report_dataset(args.input)
+    if dataset is None:
+        print("No data could be loaded.", file=sys.stderr)
+        return 1
+
+    index = write_report(dataset, args.output, args.format, args.workers)
+    print(f"Report written to {index}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import re
+import numpy as np
+
+# Default number of matches returned by a search
+SEARCH_LIMIT = 50
+
+_whitespace = re.compile(r'\s+')
+
+def normalize(text):
+    """Lowercase text and collapse its whitespace, the form labels are indexed in"""
+    return _whitespace.sub(' ', str(text)).strip().lower()
+
+def trigrams(text):
+    """Return the set of trigrams of normalized text, padded so that prefixes weigh more"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def trigram_key(gram):
+    """Pack a trigram's three code points (21 bits each) into one integer"""
+    return (ord(gram[0]) << 42) | (ord(gram[1]) << 21) | ord(gram[2])
+
+class SearchIndex:
+    """
+    In-memory search index over a list of entity names (ministries, sectors, schemes, ...)
+
+    Queries of three or more characters are matched through a trigram inverted
+    index and ranked by trigram similarity, with a bonus for names starting
+    with or containing the query, so typos still find close matches. Shorter
+    queries are prefix lookups in the sorted names. Only the posting lists of
+    the query's trigrams are read, so a search costs milliseconds even over
+    tens of thousands of names.
+    """
+
+    def __init__(self, labels):
+        self.labels = list(labels)
+        normalized = [normalize(label) for label in self.labels]
+        self.normalized = np.array(normalized, dtype=str)
+
+        # Trigram -> positions of the names containing it, built without a Python loop
+        # over the names: the padded names become a code-point matrix, every window of
+        # three code points is packed into an integer key, and sorting the (key, name)
+        # pairs groups them into posting lists
+        padded = np.array([f"  {text} " for text in normalized], dtype=str)
+        width = max(padded.dtype.itemsize // 4, 3)
+        points = padded.view(np.uint32).reshape(len(padded), -1).astype(np.int64) if len(padded) else np.zeros((0, width), dtype=np.int64)
+        keys = (points[:, :-2] << 42) | (points[:, 1:-1] << 21) | points[:, 2:]
+        valid = np.arange(points.shape[1] - 2) < (np.char.str_len(padded) - 2)[:, None]
+        owners = np.nonzero(valid)[0].astype(np.int32)
+        keys = keys[valid]
+
+        # Each trigram counts once per name
+        order = np.lexsort((owners, keys))
+        keys, owners = keys[order], owners[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = (keys[1:] != keys[:-1]) | (owners[1:] != owners[:-1])
+        keys, owners = keys[first], owners[first]
+        self.gram_counts = np.bincount(owners, minlength=len(self.labels))
+
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.arange(0)
+        ends = np.append(starts[1:], len(keys))
+        self.postings = {int(keys[start]): owners[start:end] for start, end in zip(starts, ends)}
+
+        # Names in sorted order for prefix lookups
+        self.sorted_positions = np.argsort(self.normalized, kind='stable')
+        self.sorted_names = self.normalized[self.sorted_positions]
+
+    def __len__(self):
+        return len(self.labels)
+
+    def search(self, query, limit=SEARCH_LIMIT, mask=None):
+        """
+        Return up to limit names matching query, best match first
+
+        mask, if given, is a boolean array over the indexed names; names where
+        it is False are never returned. An empty query returns names in order.
+        """
+        return [self.labels[i] for i in self.search_positions(query, limit, mask)]
+
+    def search_positions(self, query, limit=SEARCH_LIMIT, mask=None):
+        """Return the positions of the names matching query, best match first (see search)"""
+        query = normalize(query)
+
+        if not query:
+            positions = np.arange(len(self.labels))
+            if mask is not None:
+                positions = positions[mask]
+            return positions[:limit]
+
+        if len(query) < 3:
+            # Prefix lookup: the matching names are one run of the sorted names
+            start = np.searchsorted(self.sorted_names, query, side='left')
+            end = np.searchsorted(self.sorted_names, query + '\U0010ffff', side='left')
+            positions = self.sorted_positions[start:end]
+            if mask is not None:
+                positions = positions[mask[positions]]
+            return positions[:limit]
+
+        grams = {trigram_key(gram) for gram in trigrams(query)}
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return np.arange(0)
+
+        # Shared trigrams per name, counted only over the query's posting lists
+        hits = np.bincount(np.concatenate(lists), minlength=len(self.labels))
+        candidates = np.flatnonzero(hits)
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        if not len(candidates):
+            return candidates
+
+        shared = hits[candidates]
+        score = shared / (len(grams) + self.gram_counts[candidates] - shared)
+        names = self.normalized[candidates]
+        score = score + np.where(np.char.startswith(names, query), 1.0, np.where(np.char.find(names, query) >= 0, 0.5, 0.0))
+
+        if len(candidates) > limit:
+            top = np.argpartition(-score, limit - 1)[:limit]
+        else:
+            top = np.arange(len(candidates))
+        # Best score first, then alphabetical
+        top = top[np.lexsort((names[top], -score[top]))]
+        return candidates[top]
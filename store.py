@@ -0,0 +1,161 @@
+import os
+import json
+import shutil
+import tempfile
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Root directory of the on-disk budget store (override with BUDGET_STORE_DIR)
+STORE_DIR = os.environ.get(
+    'BUDGET_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.budget_store')
+)
+
+MANIFEST_NAME = 'manifest.json'
+
+# Size cap of the store in bytes (override with BUDGET_STORE_MAX_BYTES); once it is
+# exceeded the least recently used datasets are deleted
+STORE_MAX_BYTES = int(os.environ.get('BUDGET_STORE_MAX_BYTES', 2 * 1024 ** 3))
+
+def dataset_path(dataset_id, root=None):
+    """Return the directory holding a stored dataset"""
+    return os.path.join(root or STORE_DIR, dataset_id)
+
+def has_dataset(dataset_id, root=None):
+    """Check whether a dataset has been fully written to the store"""
+    return os.path.exists(os.path.join(dataset_path(dataset_id, root), MANIFEST_NAME))
+
+def save_dataset(dataset_id, data, root=None):
+    """
+    Write a per-year dataset to the store, one Feather file per year and table
+
+    Layout: <root>/<dataset_id>/<year>/<table>.feather. Files are written
+    uncompressed so they can be memory-mapped on load. Dict entries such as
+    budget_summary are stored as one-row tables. The dataset is written to a
+    temporary directory and moved into place, so readers never see a partial dataset.
+    """
+    root = root or STORE_DIR
+    os.makedirs(root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=f'.{dataset_id}-', dir=root)
+
+    try:
+        manifest = {'years': [], 'records': []}
+        for year, year_data in data.items():
+            year_dir = os.path.join(tmp_dir, str(year))
+            os.makedirs(year_dir)
+            manifest['years'].append({'name': str(year), 'year': _year_value(year), 'tables': list(year_data)})
+
+            for table_name, value in year_data.items():
+                if isinstance(value, dict):
+                    if table_name not in manifest['records']:
+                        manifest['records'].append(table_name)
+                    table = pa.Table.from_pylist([{key: _year_value(v) for key, v in value.items()}])
+                else:
+                    table = pa.Table.from_pandas(value.reset_index(drop=True), preserve_index=False)
+                feather.write_feather(table, os.path.join(year_dir, f'{table_name}.feather'),
+                                      compression='uncompressed')
+
+        # The manifest is written last and marks the dataset as complete
+        with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f)
+
+        target = dataset_path(dataset_id, root)
+        try:
+            os.replace(tmp_dir, target)
+        except OSError:
+            # Another session stored the same dataset first
+            if not has_dataset(dataset_id, root):
+                raise
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    prune_store(root=root, keep=(dataset_id,))
+
+def load_dataset(dataset_id, root=None, tables=None):
+    """
+    Load a stored dataset back into the per-year dictionary structure
+
+    Tables are memory-mapped rather than read into buffers. Pass tables to
+    load only some of them.
+    """
+    base = dataset_path(dataset_id, root)
+    with open(os.path.join(base, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    _touch(base)
+
+    data = {}
+    for entry in manifest['years']:
+        year_data = {}
+        for table_name in entry['tables']:
+            if tables is not None and table_name not in tables:
+                continue
+            path = os.path.join(base, entry['name'], f'{table_name}.feather')
+            table = feather.read_table(path, memory_map=True)
+            if table_name in manifest['records']:
+                year_data[table_name] = table.to_pylist()[0]
+            else:
+                year_data[table_name] = table.to_pandas()
+        data[entry['year']] = year_data
+
+    return data
+
+def delete_dataset(dataset_id, root=None):
+    """Remove a dataset from the store"""
+    shutil.rmtree(dataset_path(dataset_id, root), ignore_errors=True)
+
+def stored_datasets(root=None):
+    """
+    Return (dataset_id, last used, size in bytes) of every complete dataset in the
+    store, least recently used first; the manifest's mtime records the last use
+    """
+    root = root or STORE_DIR
+    try:
+        names = os.listdir(root)
+    except FileNotFoundError:
+        return []
+
+    datasets = []
+    for name in names:
+        manifest = os.path.join(root, name, MANIFEST_NAME)
+        # Datasets still being written (hidden temporary directories) have no manifest yet
+        if name.startswith('.') or not os.path.exists(manifest):
+            continue
+        size = 0
+        for folder, _, files in os.walk(os.path.join(root, name)):
+            size += sum(os.path.getsize(os.path.join(folder, file)) for file in files)
+        datasets.append((name, os.path.getmtime(manifest), size))
+    return sorted(datasets, key=lambda entry: entry[1])
+
+def prune_store(max_bytes=None, root=None, keep=()):
+    """
+    Delete the least recently used datasets until the store fits in max_bytes
+    (default STORE_MAX_BYTES); datasets in keep are never deleted. Returns the deleted ids.
+    """
+    max_bytes = STORE_MAX_BYTES if max_bytes is None else max_bytes
+    datasets = stored_datasets(root)
+    total = sum(size for _, _, size in datasets)
+
+    deleted = []
+    for dataset_id, _, size in datasets:
+        if total <= max_bytes:
+            break
+        if dataset_id in keep:
+            continue
+        delete_dataset(dataset_id, root)
+        total -= size
+        deleted.append(dataset_id)
+    return deleted
+
+def _touch(base):
+    """Mark a dataset as used now (see stored_datasets)"""
+    try:
+        os.utime(os.path.join(base, MANIFEST_NAME))
+    except OSError:
+        # A read-only store still works, it only loses its eviction order
+        pass
+
+def _year_value(value):
+    """Convert numpy scalars to plain Python values for JSON and Arrow"""
+    return value.item() if hasattr(value, 'item') else value
@@ -0,0 +1,72 @@
+"""
+Property test: the vectorized currency formatter agrees with format_currency.
+
+format_currency_array formats whole arrays with np.char.mod and inserts the
+thousands separators itself, so it is checked against format_currency on
+random amounts of every magnitude, sign and rounding case.
+Run from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add parent directory to path to import utils.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import format_currency, format_currency_array
+
+SEEDS = range(20)
+SAMPLES = 5_000
+
+
+def random_amounts(seed, size=SAMPLES):
+    """Return amounts spread over every magnitude and both signs, plus the awkward cases"""
+    rng = np.random.default_rng(seed)
+    magnitudes = 10.0 ** rng.uniform(-3, 16, size)
+    amounts = magnitudes * rng.choice([-1.0, 1.0], size)
+
+    # Whole numbers, amounts ending in half a cent (rounding ties) and bucket boundaries
+    whole = np.round(amounts[: size // 4])
+    ties = np.round(amounts[: size // 4], 2) + 0.005
+    boundaries = np.array([1e5, 1e7, 1e9, 1e12, 1e14, 1e16, 1e21])
+    boundaries = np.concatenate([
+        boundaries, -boundaries,
+        np.nextafter(boundaries, 0), np.nextafter(boundaries, np.inf)
+    ])
+    special = np.array([0.0, -0.0, 0.005, 0.995, 9.995, 99999.995, np.nan, np.inf, -np.inf])
+    return np.concatenate([amounts, whole, ties, boundaries, special])
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_matches_format_currency(seed):
+    amounts = random_amounts(seed)
+    expected = [format_currency(amount) for amount in amounts]
+    assert format_currency_array(amounts).tolist() == expected
+
+
+def test_scaled_crores_match_format_currency():
+    # The views format crores multiplied by 1e7, as format_table does
+    crores = random_amounts(0) / 1e7
+    expected = [format_currency(amount * 1e7) for amount in crores]
+    assert format_currency_array(crores * 1e7).tolist() == expected
+
+
+def test_other_currency_symbol():
+    amounts = random_amounts(1, 500)
+    expected = [format_currency(amount, currency="$") for amount in amounts]
+    assert format_currency_array(amounts, currency="$").tolist() == expected
+
+
+def test_negative_amounts_are_abbreviated():
+    assert format_currency(-2.5e7) == "₹ -2.50 Cr"
+    assert format_currency(-3e5) == "₹ -3.00 L"
+    assert format_currency_array([-2.5e7, -3e5, -99.5]).tolist() == ["₹ -2.50 Cr", "₹ -3.00 L", "₹ -99.50"]
+
+
+def test_separators_fit_in_short_arrays():
+    # Without longer values around, the commas make the plain amounts the longest strings
+    amounts = [999.995, -1234.5, 99999.995, -0.0, np.nan]
+    assert format_currency_array(amounts).tolist() == [format_currency(amount) for amount in amounts]
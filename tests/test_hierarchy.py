@@ -0,0 +1,76 @@
+"""
+BudgetHierarchy subtotals and children agree with a pandas groupby.
+
+The hierarchy answers from prefix sums over rows sorted by their path codes,
+so its totals are checked against groupby sums of the same random
+ministry -> department -> scheme table, including rows without a department
+or scheme. Run from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path to import utils.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import encode_dimensions
+from hierarchy import BudgetHierarchy, UNSPECIFIED_LABEL
+
+VALUE = 'Allocation (in Crores)'
+ROWS = 400
+
+
+def make_allocations(seed):
+    """Return a shuffled ministry_allocation table with some missing departments and schemes"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Ministry': rng.choice([f"Ministry {i}" for i in range(5)], ROWS),
+        'Department': rng.choice([f"Department {i}" for i in range(4)] + [None], ROWS),
+        'Scheme': rng.choice([f"Scheme {i}" for i in range(30)] + [None], ROWS),
+        VALUE: rng.uniform(1, 1000, ROWS)
+    })
+
+
+@pytest.mark.parametrize('encoded', [False, True])
+@pytest.mark.parametrize('seed', range(3))
+def test_subtotals_match_groupby(seed, encoded):
+    frame = make_allocations(seed)
+    if encoded:
+        frame = encode_dimensions({2024: {'ministry_allocation': frame}})[2024]['ministry_allocation']
+    hierarchy = BudgetHierarchy.from_frame(frame)
+    paths = frame[['Ministry', 'Department', 'Scheme']].astype(object).fillna(UNSPECIFIED_LABEL)
+
+    assert hierarchy.total == pytest.approx(frame[VALUE].sum())
+    for depth in range(1, 4):
+        levels = ['Ministry', 'Department', 'Scheme'][:depth]
+        expected = frame[VALUE].groupby([paths[level] for level in levels]).sum()
+        for path, total in expected.items():
+            path = path if isinstance(path, tuple) else (path,)
+            assert hierarchy.subtotal(path) == pytest.approx(total)
+
+
+def test_children_match_groupby():
+    frame = make_allocations(0)
+    hierarchy = BudgetHierarchy.from_frame(frame)
+    ministry = frame['Ministry'].iloc[0]
+
+    children = hierarchy.children((ministry,))
+    rows = frame[frame['Ministry'] == ministry]
+    expected = rows[VALUE].groupby(rows['Department'].astype(object).fillna(UNSPECIFIED_LABEL)).sum()
+
+    assert list(children.columns) == ['Department', VALUE, 'Share (%)']
+    assert dict(zip(children['Department'], children[VALUE])) == pytest.approx(expected.to_dict())
+    # Largest first, with shares of the ministry's total
+    assert (np.diff(children[VALUE].to_numpy()) <= 0).all()
+    assert children['Share (%)'].to_numpy() == pytest.approx(children[VALUE].to_numpy() / expected.sum() * 100)
+
+
+def test_ministry_children_are_the_rollup():
+    frame = make_allocations(1)
+    ministries = BudgetHierarchy.from_frame(frame).children()
+    expected = frame.groupby('Ministry')[VALUE].sum()
+    assert dict(zip(ministries['Ministry'], ministries[VALUE])) == pytest.approx(expected.to_dict())
@@ -0,0 +1,67 @@
+"""
+Streamed CSV ingest agrees with the in-memory path.
+
+stream_csv_data aggregates a CSV chunk by chunk, folding the chunk totals
+together, while process_uploaded_data works on the whole frame; both must
+give the same years, budget summaries and summed allocations. A tiny chunk
+size makes repeated rows and years span many chunks. Run from the repository
+root:
+
+    python -m pytest tests
+"""
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path to import utils.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import HIERARCHY_LEVELS, process_uploaded_data, stream_csv_data
+
+ROWS = 300
+
+
+def make_csv(seed, levels=HIERARCHY_LEVELS):
+    """Return a shuffled CSV upload with repeated rows, missing allocations and several years"""
+    rng = np.random.default_rng(seed)
+    columns = {
+        'Year': rng.choice([2022, 2023, 2024], ROWS),
+        'Ministry': rng.choice([f"Ministry {i}" for i in range(6)], ROWS),
+        'Department': rng.choice([f"Department {i}" for i in range(3)], ROWS),
+        'Scheme': rng.choice([f"Scheme {i}" for i in range(20)], ROWS),
+        'Allocation': np.where(rng.random(ROWS) < 0.1, np.nan, rng.uniform(1, 1000, ROWS).round(2)),
+        'Total_Budget': rng.uniform(1e5, 1e6, ROWS).round(2),
+        'Fiscal_Deficit': rng.uniform(1e4, 1e5, ROWS).round(2),
+        'Fiscal_Deficit_Percentage': rng.uniform(1, 8, ROWS).round(2),
+        'GDP': rng.uniform(1e6, 1e7, ROWS).round(2)
+    }
+    frame = pd.DataFrame(columns).drop(columns=[level for level in HIERARCHY_LEVELS if level not in levels])
+    upload = io.BytesIO(frame.to_csv(index=False).encode())
+    upload.name = 'budget.csv'
+    return upload
+
+
+def sorted_rows(frame):
+    """Return a ministry_allocation frame with plain string labels, sorted by its labels"""
+    labels = [column for column in frame.columns if column != 'Allocation (in Crores)']
+    frame = frame.astype({column: str for column in labels})
+    return frame.sort_values(labels).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('levels', [HIERARCHY_LEVELS, ['Ministry'], []])
+@pytest.mark.parametrize('seed', range(3))
+def test_streamed_csv_matches_process_uploaded_data(seed, levels):
+    upload = make_csv(seed, levels)
+    streamed = stream_csv_data(upload, chunksize=7)
+    upload.seek(0)
+    expected = process_uploaded_data(pd.read_csv(upload))
+
+    assert list(streamed) == list(expected)
+    for year in expected:
+        assert streamed[year]['budget_summary'] == expected[year]['budget_summary']
+        rows = sorted_rows(streamed[year]['ministry_allocation'])
+        expected_rows = sorted_rows(expected[year]['ministry_allocation'])
+        pd.testing.assert_frame_equal(rows, expected_rows, check_dtype=False)
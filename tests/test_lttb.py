@@ -0,0 +1,45 @@
+"""
+LTTB downsampling keeps the endpoints and returns ascending indices.
+
+lttb_indices picks one point per bucket for the WebGL line charts; the kept
+indices must start at the first point, end at the last, be strictly
+increasing and number exactly the threshold, and a spike must survive. Run
+from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add parent directory to path to import utils.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import lttb_indices
+
+
+@pytest.mark.parametrize('length, threshold', [(10, 3), (1000, 50), (10_001, 2000), (5000, 4999)])
+def test_endpoints_and_monotonic_indices(length, threshold):
+    rng = np.random.default_rng(length)
+    x = np.sort(rng.uniform(0, 100, length))
+    y = rng.normal(size=length).cumsum()
+
+    keep = lttb_indices(x, y, threshold)
+    assert len(keep) == threshold
+    assert keep[0] == 0
+    assert keep[-1] == length - 1
+    assert (np.diff(keep) > 0).all()
+
+
+def test_short_series_are_kept_whole():
+    x = np.arange(10.0)
+    assert lttb_indices(x, x, 20).tolist() == list(range(10))
+    assert lttb_indices(x, x, 2).tolist() == list(range(10))
+
+
+def test_spike_survives():
+    x = np.arange(1000.0)
+    y = np.zeros(1000)
+    y[637] = 50.0
+    assert 637 in lttb_indices(x, y, 40)
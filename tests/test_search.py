@@ -0,0 +1,68 @@
+"""
+SearchIndex ranking and masks.
+
+Checks that exact and prefix matches rank first, that misspelled queries
+still find the intended name through shared trigrams, that short queries are
+prefix lookups, and that a mask hides names from every kind of query. Run
+from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path to import utils.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from search import SearchIndex
+
+NAMES = [
+    'Ministry of Defence',
+    'Ministry of Health and Family Welfare',
+    'Ministry of Railways',
+    'Department of Health Research',
+    'Ministry of Road Transport and Highways',
+    'Rural Development'
+]
+
+
+def test_prefix_match_ranks_first():
+    index = SearchIndex(NAMES)
+    assert index.search('ministry of rail')[0] == 'Ministry of Railways'
+    # A name containing the query beats one that only shares trigrams with it
+    results = index.search('health')
+    assert set(results[:2]) == {'Ministry of Health and Family Welfare', 'Department of Health Research'}
+
+
+def test_typo_finds_close_match():
+    index = SearchIndex(NAMES)
+    assert index.search('defnce')[0] == 'Ministry of Defence'
+    assert index.search('Railwys')[0] == 'Ministry of Railways'
+
+
+def test_short_query_is_prefix_lookup():
+    index = SearchIndex(NAMES)
+    assert index.search('ru') == ['Rural Development']
+    assert index.search('mi', limit=2) == ['Ministry of Defence', 'Ministry of Health and Family Welfare']
+
+
+def test_empty_query_lists_names_in_order():
+    index = SearchIndex(NAMES)
+    assert index.search('') == NAMES
+    assert index.search('  ', limit=3) == NAMES[:3]
+
+
+def test_mask_hides_names():
+    index = SearchIndex(NAMES)
+    mask = np.array(['Health' not in name for name in NAMES])
+    assert 'Ministry of Health and Family Welfare' not in index.search('health', mask=mask)
+    assert 'Department of Health Research' not in index.search('de', mask=mask)
+    assert index.search('', mask=mask) == [name for name in NAMES if 'Health' not in name]
+    assert index.search('ministry of health', mask=~np.ones(len(NAMES), dtype=bool)) == []
+
+
+def test_no_match():
+    index = SearchIndex(NAMES)
+    assert index.search('xyzzy') == []
+    assert len(SearchIndex([]).search('anything')) == 0
@@ -1,28 +1,27 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import sys
 import os
 
 # Add parent directory to path to import utils.py
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils import load_data, create_bar_chart, create_pie_chart, create_donut_chart, format_currency, generate_insights
+from layout import show_sections, show_paginated_table
+from utils import format_currency, format_table
+from figures import year_bar_figure, year_share_figure, capital_gauge_figure, drilldown_figure
+from hierarchy import budget_hierarchy
+from insights import year_insights
 
-def show(uploaded_file=None, use_sample=True):
+def show(data):
     """Display the This Year view of budget data"""
     # Page header
     st.markdown('<div class="main-header">This Year\'s Budget</div>', unsafe_allow_html=True)
     
-    # Load data
-    data = load_data(uploaded_file, use_sample)
-    
     if data is None:
         st.error("No data available. Please upload a file or use sample data.")
         return
     
     # Get the current year (latest year in the data)
-    current_year = max(data.keys())
+    current_year = data.latest_year
     
     # Display current year in the header
     st.markdown(f'<div class="sub-header">Budget Analysis for {current_year}</div>', unsafe_allow_html=True)
@@ -30,11 +29,8 @@ def show(uploaded_file=None, use_sample=True):
     # Get data for the current year
     year_data = data[current_year]
     
-    # Create tabs for different sections
-    tabs = st.tabs(["Key Stats", "Ministry Allocations", "Sector-wise Expenditure", "Revenue Sources", "Capital vs Revenue"])
-    
     # Tab 1: Key Stats
-    with tabs[0]:
+    def key_stats():
         st.markdown('<div class="section-header">Budget Summary</div>', unsafe_allow_html=True)
         
         # Display key stats in a grid
@@ -56,48 +52,90 @@ def show(uploaded_file=None, use_sample=True):
         # Insights
         st.markdown('<div class="section-header">Insights</div>', unsafe_allow_html=True)
         
-        insights = generate_insights(data, current_year)
+        # Computed once per dataset, from the year's ministry rollup
+        insights = year_insights(data, current_year).messages
         
         with st.container():
             for insight in insights:
                 st.markdown(f"• {insight}")
     
     # Tab 2: Ministry Allocations
-    with tabs[1]:
+    def ministry_allocations():
         st.markdown('<div class="section-header">Ministry-wise Budget Allocation</div>', unsafe_allow_html=True)
         
-        ministry_df = year_data['ministry_allocation'].sort_values('Allocation (in Crores)', ascending=False)
+        # One row per ministry, rolled up from its departments and schemes (largest first)
+        ministry_df = budget_hierarchy(data, current_year).children()
         
-        # Display ministry allocation table
-        st.dataframe(
-            ministry_df.style.format({
-                'Allocation (in Crores)': lambda x: format_currency(x * 1e7)
-            }),
-            use_container_width=True,
-            hide_index=True
+        # Display ministry allocation table, one page at a time
+        show_paginated_table(
+            ministry_df,
+            key='this_year_ministries',
+            label_column='Ministry',
+            currency_columns=['Allocation (in Crores)'],
+            percent_columns=['Share (%)']
         )
         
-        # Display horizontal bar chart
-        ministry_fig = create_bar_chart(
-            ministry_df, 
-            'Ministry', 
-            'Allocation (in Crores)', 
-            f"Ministry-wise Budget Allocation ({current_year})",
-            horizontal=True
-        )
-        st.plotly_chart(ministry_fig, use_container_width=True)
+        # Display horizontal bar chart and pie chart
+        st.plotly_chart(year_bar_figure('ministry_allocation', ministry_df, current_year), use_container_width=True)
+        st.plotly_chart(year_share_figure('ministry_allocation', ministry_df, current_year), use_container_width=True)
+    
+    # Tab 3: Budget Drill-down
+    def budget_drill_down():
+        st.markdown('<div class="section-header">Budget Drill-down</div>', unsafe_allow_html=True)
         
-        # Display pie chart
-        ministry_pie = create_pie_chart(
-            ministry_df,
-            'Allocation (in Crores)',
-            'Ministry',
-            f"Proportion of Budget Allocation by Ministry ({current_year})"
+        # Rollup index of the year's ministry -> department -> scheme hierarchy (built once per dataset)
+        hierarchy = budget_hierarchy(data, current_year)
+        chart_kind = st.radio("Chart", ["Treemap", "Sunburst"], horizontal=True, key='this_year_drill_chart')
+        
+        # Find any scheme (or the lowest level available) by name
+        if len(hierarchy.levels) > 1:
+            query = st.text_input(f"Find a {hierarchy.levels[-1]}", key='this_year_drill_find', placeholder="Type part of a name")
+            if query:
+                matches = hierarchy.find(query)
+                st.dataframe(
+                    format_table(matches, currency_columns=['Allocation (in Crores)']),
+                    use_container_width=True,
+                    hide_index=True
+                )
+        
+        # Expand one node per level; only the children of the expanded node are fetched
+        path = []
+        children = hierarchy.children(())
+        cols = st.columns(max(1, len(hierarchy.levels) - 1))
+        for depth, level in enumerate(hierarchy.levels[:-1]):
+            with cols[depth]:
+                choice = st.selectbox(
+                    f"Select a {level}",
+                    ["All"] + list(children[level]),
+                    key=f"this_year_drill_{'/'.join(path)}"
+                )
+            if choice == "All":
+                break
+            path.append(choice)
+            children = hierarchy.children(tuple(path))
+        
+        level = hierarchy.levels[len(path)]
+        node_label = path[-1] if path else f"Union Budget {current_year}"
+        
+        st.metric(f"{node_label} Allocation", format_currency(hierarchy.subtotal(path) * 1e7))
+        
+        drill_fig = drilldown_figure(hierarchy, current_year, path, kind=chart_kind.lower())
+        st.plotly_chart(drill_fig, use_container_width=True)
+        
+        # Every child of the node, one page at a time
+        show_paginated_table(
+            children,
+            key='this_year_drill_table',
+            label_column=level,
+            currency_columns=['Allocation (in Crores)'],
+            percent_columns=['Share (%)']
         )
-        st.plotly_chart(ministry_pie, use_container_width=True)
+        
+        if len(hierarchy.levels) == 1:
+            st.info("Upload data with Department and Scheme columns to drill down below ministries.")
     
-    # Tab 3: Sector-wise Expenditure
-    with tabs[2]:
+    # Tab 4: Sector-wise Expenditure
+    def sector_expenditure():
         st.markdown('<div class="section-header">Sector-wise Expenditure</div>', unsafe_allow_html=True)
         
         if 'sector_expenditure' in year_data:
@@ -105,36 +143,22 @@ def show(uploaded_file=None, use_sample=True):
             
             # Display sector expenditure table
             st.dataframe(
-                sector_df.style.format({
-                    'Expenditure (in Crores)': lambda x: format_currency(x * 1e7)
-                }),
+                format_table(
+                    sector_df,
+                    currency_columns=['Expenditure (in Crores)']
+                ),
                 use_container_width=True,
                 hide_index=True
             )
             
-            # Display horizontal bar chart
-            sector_fig = create_bar_chart(
-                sector_df, 
-                'Sector', 
-                'Expenditure (in Crores)', 
-                f"Sector-wise Expenditure ({current_year})",
-                horizontal=True
-            )
-            st.plotly_chart(sector_fig, use_container_width=True)
-            
-            # Display donut chart
-            sector_donut = create_donut_chart(
-                sector_df,
-                'Expenditure (in Crores)',
-                'Sector',
-                f"Proportion of Expenditure by Sector ({current_year})"
-            )
-            st.plotly_chart(sector_donut, use_container_width=True)
+            # Display horizontal bar chart and donut chart
+            st.plotly_chart(year_bar_figure('sector_expenditure', sector_df, current_year), use_container_width=True)
+            st.plotly_chart(year_share_figure('sector_expenditure', sector_df, current_year), use_container_width=True)
         else:
             st.info("Sector-wise expenditure data not available for this year.")
     
-    # Tab 4: Revenue Sources
-    with tabs[3]:
+    # Tab 5: Revenue Sources
+    def revenue_sources():
         st.markdown('<div class="section-header">Revenue Sources</div>', unsafe_allow_html=True)
         
         if 'revenue_sources' in year_data:
@@ -142,35 +166,22 @@ def show(uploaded_file=None, use_sample=True):
             
             # Display revenue sources table
             st.dataframe(
-                revenue_df.style.format({
-                    'Amount (in Crores)': lambda x: format_currency(x * 1e7)
-                }),
+                format_table(
+                    revenue_df,
+                    currency_columns=['Amount (in Crores)']
+                ),
                 use_container_width=True,
                 hide_index=True
             )
             
-            # Display bar chart
-            revenue_fig = create_bar_chart(
-                revenue_df, 
-                'Source', 
-                'Amount (in Crores)', 
-                f"Revenue Sources ({current_year})"
-            )
-            st.plotly_chart(revenue_fig, use_container_width=True)
-            
-            # Display pie chart
-            revenue_pie = create_pie_chart(
-                revenue_df,
-                'Amount (in Crores)',
-                'Source',
-                f"Proportion of Revenue by Source ({current_year})"
-            )
-            st.plotly_chart(revenue_pie, use_container_width=True)
+            # Display bar chart and pie chart
+            st.plotly_chart(year_bar_figure('revenue_sources', revenue_df, current_year), use_container_width=True)
+            st.plotly_chart(year_share_figure('revenue_sources', revenue_df, current_year), use_container_width=True)
         else:
             st.info("Revenue sources data not available for this year.")
     
-    # Tab 5: Capital vs Revenue Expenditure
-    with tabs[4]:
+    # Tab 6: Capital vs Revenue Expenditure
+    def capital_vs_revenue():
         st.markdown('<div class="section-header">Capital vs Revenue Expenditure</div>', unsafe_allow_html=True)
         
         if 'spending_type' in year_data:
@@ -178,46 +189,26 @@ def show(uploaded_file=None, use_sample=True):
             
             # Display spending type table
             st.dataframe(
-                spending_df.style.format({
-                    'Amount (in Crores)': lambda x: format_currency(x * 1e7)
-                }),
+                format_table(
+                    spending_df,
+                    currency_columns=['Amount (in Crores)']
+                ),
                 use_container_width=True,
                 hide_index=True
             )
             
-            # Display pie chart
-            spending_pie = create_pie_chart(
-                spending_df,
-                'Amount (in Crores)',
-                'Type',
-                f"Capital vs Revenue Expenditure ({current_year})"
-            )
-            st.plotly_chart(spending_pie, use_container_width=True)
-            
-            # Calculate percentages
-            total = spending_df['Amount (in Crores)'].sum()
-            spending_df['Percentage'] = (spending_df['Amount (in Crores)'] / total) * 100
-            
-            # Create a gauge chart
-            capital_percentage = spending_df.loc[spending_df['Type'] == 'Capital Expenditure', 'Percentage'].iloc[0]
-            
-            gauge_fig = go.Figure(go.Indicator(
-                mode = "gauge+number",
-                value = capital_percentage,
-                title = {'text': "Capital Expenditure (% of Total)"},
-                gauge = {
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "royalblue"},
-                    'steps': [
-                        {'range': [0, 20], 'color': "lightcoral"},
-                        {'range': [20, 40], 'color': "lightsalmon"},
-                        {'range': [40, 60], 'color': "lightgreen"},
-                        {'range': [60, 80], 'color': "mediumseagreen"},
-                        {'range': [80, 100], 'color': "seagreen"}
-                    ]
-                }
-            ))
-            
-            st.plotly_chart(gauge_fig, use_container_width=True)
+            # Display pie chart and a gauge of the capital expenditure share
+            st.plotly_chart(year_share_figure('spending_type', spending_df, current_year), use_container_width=True)
+            st.plotly_chart(capital_gauge_figure(spending_df), use_container_width=True)
         else:
-            st.info("Capital vs Revenue expenditure data not available for this year.") 
\ No newline at end of file
+            st.info("Capital vs Revenue expenditure data not available for this year.")
+    
+    # Render only the selected section (see layout.LAZY_SECTIONS)
+    show_sections([
+        ("Key Stats", key_stats),
+        ("Ministry Allocations", ministry_allocations),
+        ("Budget Drill-down", budget_drill_down),
+        ("Sector-wise Expenditure", sector_expenditure),
+        ("Revenue Sources", revenue_sources),
+        ("Capital vs Revenue", capital_vs_revenue)
+    ], key='this_year_section')
\ No newline at end of file
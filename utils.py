@@ -1,39 +1,268 @@
 import pandas as pd
 import numpy as np
 import os
+import io
+import hashlib
+import importlib.util
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 import plotly.express as px
 import plotly.graph_objects as go
+import store
 
-def load_data(uploaded_file=None, use_sample=True):
+# Maximum number of processed uploads kept in memory (least recently used is evicted first)
+INGEST_CACHE_SIZE = 8
+
+# CSV uploads larger than this are streamed in chunks instead of read whole
+STREAM_THRESHOLD_BYTES = 64 * 1024 * 1024
+# Rows per chunk when streaming, which bounds peak memory during ingestion
+STREAM_CHUNK_ROWS = 100_000
+# Streamed chunk totals collected before they are folded into one table
+STREAM_REDUCE_CHUNKS = 16
+
+# Excel engines tried in order of preference; calamine (Rust) is much faster than
+# openpyxl, which pandas falls back to when none of these is installed
+EXCEL_ENGINES = [('calamine', 'python_calamine')]
+# Worker processes for reading workbook sheets in parallel (None = one per CPU)
+EXCEL_MAX_WORKERS = None
+
+# Store id of the sample dataset; bump the version whenever get_sample_data changes
+SAMPLE_DATASET_ID = 'sample-v1'
+# Version of the upload processing, part of the store id of every converted upload;
+# bump it whenever process_uploaded_data or stream_csv_data changes their output
+UPLOAD_PROCESSING_VERSION = 1
+
+# Maximum number of chart figures kept in the figure cache (as JSON)
+FIGURE_CACHE_SIZE = 256
+
+# Bars or slices drawn per bar/pie chart; the remaining rows are folded into one
+# "Others" entry so the figure payload stays bounded (0 disables folding)
+CHART_TOP_N = 20
+CHART_OTHERS_LABEL = 'Others'
+
+# Line charts with more points than this are downsampled (LTTB) to this many
+# points and drawn with WebGL (Scattergl) instead of SVG
+LINE_MAX_POINTS = 2000
+
+_ingest_cache = OrderedDict()
+_ingest_cache_lock = threading.Lock()
+
+_figure_cache = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+# Workbook opened by _open_workbook in each sheet-reading worker process
+_worker_workbook = None
+
+def load_data(uploaded_file=None, use_sample=True, progress=None):
     """
     Load data from uploaded file or use sample data
     Returns a dictionary with dataframes for different years
+    
+    progress, if given, is called with the fraction of a streamed upload read so far
     """
     data = {}
     
     if uploaded_file is not None:
         # Handle uploaded file
         try:
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file)
-            else:  # Excel file
-                df = pd.read_excel(uploaded_file)
-                
-            # Process the dataframe
-            data = process_uploaded_data(df)
+            is_csv = uploaded_file.name.endswith('.csv')
+            
+            # Serve previously processed uploads without touching the parser
+            cache_key = (hash_upload(uploaded_file), is_csv)
+            data = _ingest_cache_get(cache_key)
+            if data is not None:
+                return data
+            
+            # Uploads converted in an earlier session are reopened from the store
+            dataset_id = upload_dataset_id(cache_key[0], is_csv)
+            if store.has_dataset(dataset_id):
+                data = encode_dimensions(store.load_dataset(dataset_id))
+                _ingest_cache_put(cache_key, data)
+                return data
+            
+            if is_csv and upload_size(uploaded_file) > STREAM_THRESHOLD_BYTES:
+                # Aggregate large CSVs chunk by chunk instead of holding them in memory
+                data = stream_csv_data(uploaded_file, progress=progress)
+            else:
+                if is_csv:
+                    df = pd.read_csv(uploaded_file)
+                else:  # Excel file, every sheet
+                    df = read_excel_sheets(uploaded_file)
+                    
+                # Process the dataframe
+                data = process_uploaded_data(df)
+            _save_to_store(dataset_id, data)
+            _ingest_cache_put(cache_key, data)
             return data
         except Exception as e:
             print(f"Error loading uploaded file: {e}")
             # If error in uploaded file, fall back to sample data if selected
             if use_sample:
-                return get_sample_data()
+                return load_sample_data()
             return None
     
     if use_sample:
-        return get_sample_data()
+        return load_sample_data()
     
     return None
 
+def load_sample_data():
+    """Load the sample data from the store, converting it on first use"""
+    try:
+        if not store.has_dataset(SAMPLE_DATASET_ID):
+            store.save_dataset(SAMPLE_DATASET_ID, get_sample_data())
+        return encode_dimensions(store.load_dataset(SAMPLE_DATASET_ID))
+    except Exception as e:
+        print(f"Error reading sample data from the store: {e}")
+        return get_sample_data()
+
+def _save_to_store(dataset_id, data):
+    """Persist processed data; a failed write only costs a re-parse next session"""
+    try:
+        store.save_dataset(dataset_id, data)
+    except Exception as e:
+        print(f"Error writing {dataset_id} to the store: {e}")
+
+def hash_upload(uploaded_file, block_size=1 << 20):
+    """Return a hex digest of the uploaded file's bytes, read in blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    uploaded_file.seek(0)
+    for block in iter(lambda: uploaded_file.read(block_size), b''):
+        digest.update(block)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+def upload_dataset_id(upload_hash, is_csv):
+    """Return the store id of a converted upload, from its content hash (see hash_upload)"""
+    return f"upload-v{UPLOAD_PROCESSING_VERSION}-{upload_hash}-{'csv' if is_csv else 'xlsx'}"
+
+def upload_size(uploaded_file):
+    """Return the size of the uploaded file in bytes"""
+    size = getattr(uploaded_file, 'size', None)
+    if size is None:
+        size = uploaded_file.seek(0, os.SEEK_END)
+        uploaded_file.seek(0)
+    return size
+
+def excel_engine():
+    """Return the fastest installed Excel engine, or None for the pandas default"""
+    for engine, module in EXCEL_ENGINES:
+        if importlib.util.find_spec(module) is not None:
+            return engine
+    return None
+
+def read_excel_sheets(uploaded_file, max_workers=EXCEL_MAX_WORKERS):
+    """
+    Read every sheet of an Excel upload and merge them into one frame
+    
+    Sheets are parsed in parallel in a process pool (sequentially when the pool
+    is unavailable). A sheet without a Year column takes its year from the sheet
+    name when the name is a year (one sheet per year); in a workbook of several
+    sheets, a sheet without a Ministry column takes the sheet name as its
+    ministry (one sheet per ministry).
+    """
+    uploaded_file.seek(0)
+    content = uploaded_file.read()
+    uploaded_file.seek(0)
+    engine = excel_engine()
+    
+    workbook = pd.ExcelFile(io.BytesIO(content), engine=engine)
+    sheet_names = workbook.sheet_names
+    if len(sheet_names) > 1:
+        # Every worker receives the workbook bytes once, through the initializer
+        sheets = run_in_pool(
+            _read_excel_sheet, [(name,) for name in sheet_names], max_workers,
+            initializer=_open_workbook, initargs=(content, engine), fallback=workbook.parse, label="Reading sheets"
+        )
+    else:
+        sheets = [workbook.parse(name) for name in sheet_names]
+    
+    return merge_sheets(sheet_names, sheets)
+
+def run_in_pool(func, args_list, max_workers=None, initializer=None, initargs=(), fallback=None, label="Running", progress=None):
+    """
+    Call func with every argument tuple of args_list in a process pool and return the results in order
+    
+    The pool has one worker per task, up to max_workers (None = one per CPU). When
+    the pool is unavailable the tasks run sequentially in this process, through
+    fallback when given (e.g. a function that needs no initializer), else func.
+    progress, if given, is called with the fraction of tasks done.
+    """
+    results = [None] * len(args_list)
+    if not args_list:
+        return results
+    workers = min(len(args_list), max_workers or os.cpu_count() or 1)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+            futures = {pool.submit(func, *args): i for i, args in enumerate(args_list)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                results[futures[future]] = future.result()
+                if progress is not None:
+                    progress(done / len(args_list))
+    except (OSError, BrokenProcessPool) as e:
+        print(f"{label} sequentially, process pool unavailable: {e}")
+        for i, args in enumerate(args_list):
+            results[i] = (fallback or func)(*args)
+            if progress is not None:
+                progress((i + 1) / len(args_list))
+    return results
+
+def merge_sheets(sheet_names, sheets):
+    """
+    Merge named sheets into one frame, filling a missing Year column from a
+    sheet name that is a year and, when there are several sheets, a missing
+    Ministry column from any other name (a lone sheet's default name such as
+    "Sheet1" is no ministry)
+    """
+    per_ministry = len(sheet_names) > 1
+    frames = []
+    for name, sheet in zip(sheet_names, sheets):
+        if sheet.empty:
+            continue
+        name = str(name).strip()
+        if 'Year' not in sheet.columns and name.isdigit():
+            sheet = sheet.assign(Year=int(name))
+        if per_ministry and 'Ministry' not in sheet.columns and not name.isdigit():
+            sheet = sheet.assign(Ministry=name)
+        frames.append(sheet)
+    
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+def _open_workbook(content, engine):
+    """Open the workbook given as bytes once per worker process (pool initializer)"""
+    global _worker_workbook
+    _worker_workbook = pd.ExcelFile(io.BytesIO(content), engine=engine)
+
+def _read_excel_sheet(sheet_name):
+    """Parse one sheet of the worker's workbook (runs in a worker process)"""
+    return _worker_workbook.parse(sheet_name)
+
+def _ingest_cache_get(key):
+    """Return the processed data cached under key, or None on a miss"""
+    with _ingest_cache_lock:
+        data = _ingest_cache.get(key)
+        if data is not None:
+            _ingest_cache.move_to_end(key)
+        return data
+
+def _ingest_cache_put(key, data):
+    """Cache processed data under key, evicting the least recently used entries"""
+    with _ingest_cache_lock:
+        _ingest_cache[key] = data
+        _ingest_cache.move_to_end(key)
+        while len(_ingest_cache) > INGEST_CACHE_SIZE:
+            _ingest_cache.popitem(last=False)
+
+def clear_ingest_cache():
+    """Drop every cached upload"""
+    with _ingest_cache_lock:
+        _ingest_cache.clear()
+
 def get_sample_data():
     """Generate sample budget data for demonstration"""
     # Create a dictionary to hold budget data for multiple years
@@ -135,7 +364,88 @@ def get_sample_data():
         }
     }
     
-    return data
+    return encode_dimensions(data)
+
+# Label and value columns of each per-year table
+TABLE_COLUMNS = {
+    'ministry_allocation': ('Ministry', 'Allocation (in Crores)'),
+    'sector_expenditure': ('Sector', 'Expenditure (in Crores)'),
+    'revenue_sources': ('Source', 'Amount (in Crores)'),
+    'spending_type': ('Type', 'Amount (in Crores)')
+}
+
+# Budget summary entries and the uploaded columns they are read from
+SUMMARY_COLUMNS = {
+    'Total Budget': 'Total_Budget',
+    'Fiscal Deficit': 'Fiscal_Deficit',
+    'Fiscal Deficit %': 'Fiscal_Deficit_Percentage',
+    'GDP': 'GDP'
+}
+
+# Levels of the budget hierarchy, top down; uploads may carry Department and Scheme
+# columns below Ministry, which are kept in ministry_allocation
+HIERARCHY_LEVELS = ['Ministry', 'Department', 'Scheme']
+
+# Label columns encoded as shared categoricals (see encode_dimensions): the table
+# labels, whose categories are sorted, and the hierarchy levels below Ministry
+TABLE_LABELS = [label_col for label_col, _ in TABLE_COLUMNS.values()]
+DIMENSION_COLUMNS = TABLE_LABELS + [level for level in HIERARCHY_LEVELS if level not in TABLE_LABELS]
+
+# Budget summary metrics, in display order
+SUMMARY_METRICS = ['Total Budget', 'Fiscal Deficit', 'Fiscal Deficit %', 'Revenue Deficit', 'Revenue Deficit %', 'GDP']
+
+def encode_dimensions(data):
+    """
+    Encode the label columns of every table (Ministry, Sector, Source, Type and the
+    Department and Scheme levels) as categoricals sharing one dimension dictionary
+    per column, so merges, pivots and groupbys work on integer codes instead of
+    hashing strings
+
+    Each column's labels across all years are hashed once (pd.factorize) and the
+    categoricals are built straight from the codes. Columns already encoded with
+    the same categories in every year are left as they are.
+    """
+    columns = {}
+    for year, year_data in data.items():
+        for table, frame in year_data.items():
+            if not isinstance(frame, pd.DataFrame):
+                continue
+            for column in DIMENSION_COLUMNS:
+                if column in frame.columns:
+                    columns.setdefault(column, []).append((year, table))
+    
+    encoded = {year: dict(year_data) for year, year_data in data.items()}
+    for column, places in columns.items():
+        parts = [data[year][table][column] for year, table in places]
+        dtype = parts[0].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and all(
+            isinstance(part.dtype, pd.CategoricalDtype) and (part.dtype is dtype or part.cat.categories.equals(dtype.categories))
+            for part in parts[1:]
+        ):
+            continue
+        
+        # One factorize over every year; an already encoded column contributes
+        # only its categories, and its rows are remapped through their codes
+        labels = [pd.Series(part.cat.categories) if isinstance(part.dtype, pd.CategoricalDtype) else part for part in parts]
+        codes, dtype = factorize_labels(pd.concat(labels, ignore_index=True) if len(labels) > 1 else labels[0], column)
+        offsets = np.cumsum([0] + [len(part) for part in labels])
+        for k, (year, table) in enumerate(places):
+            part_codes = codes[offsets[k]:offsets[k + 1]]
+            if isinstance(parts[k].dtype, pd.CategoricalDtype):
+                part_codes = np.append(part_codes, -1)[parts[k].cat.codes.to_numpy()]
+            encoded[year][table] = encoded[year][table].assign(**{column: pd.Categorical.from_codes(part_codes, dtype=dtype)})
+    return encoded
+
+def factorize_labels(labels, column):
+    """
+    Hash a label column once and return (codes, categorical dtype); missing labels get code -1
+
+    Categories of the table label columns (Ministry, Sector, ...) are sorted, so a
+    label keeps its code across sessions; the Department and Scheme levels, with up
+    to one label per row, keep first-seen order, which saves sorting them.
+    """
+    codes, uniques = pd.factorize(labels, sort=column in TABLE_LABELS)
+    return codes, pd.CategoricalDtype(pd.Index(uniques), ordered=False)
 
 def process_uploaded_data(df):
     """Process uploaded data to fit the application structure"""
@@ -147,48 +457,190 @@ def process_uploaded_data(df):
     
     data = {}
     
+    # Resolve the optional columns once instead of once per year
+    summary_df = pd.DataFrame({
+        key: df[column] if column in df.columns else 0
+        for key, column in SUMMARY_COLUMNS.items()
+    }, index=df.index)
+    
     # Check if the dataframe has a 'Year' column
     if 'Year' in df.columns:
-        years = df['Year'].unique()
-        
-        for year in years:
-            year_data = df[df['Year'] == year]
-            
-            # Create a basic structure for the year's data
-            data[year] = {
-                'ministry_allocation': pd.DataFrame({
-                    'Ministry': year_data['Ministry'] if 'Ministry' in year_data.columns else ['N/A'],
-                    'Allocation (in Crores)': year_data['Allocation'] if 'Allocation' in year_data.columns else [0]
-                }),
-                
-                'budget_summary': {
-                    'Total Budget': year_data['Total_Budget'].iloc[0] if 'Total_Budget' in year_data.columns else 0,
-                    'Fiscal Deficit': year_data['Fiscal_Deficit'].iloc[0] if 'Fiscal_Deficit' in year_data.columns else 0,
-                    'Fiscal Deficit %': year_data['Fiscal_Deficit_Percentage'].iloc[0] if 'Fiscal_Deficit_Percentage' in year_data.columns else 0,
-                    'GDP': year_data['GDP'].iloc[0] if 'GDP' in year_data.columns else 0
-                }
-            }
+        # Stable sort of the rows by year, so that every year becomes one contiguous block
+        codes, years = pd.factorize(df['Year'], sort=False)
+        if len(years) < np.iinfo(np.int16).max:
+            # Small integer codes let numpy use a linear-time radix sort
+            codes = codes.astype(np.int16)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(years) + 1))
+        # Rows with a missing year (code -1) sort first and are left out
+        order = order[bounds[0]:]
+        bounds = bounds - bounds[0]
     else:
         # If no year column, assume it's for a single year (current year)
-        current_year = 2024
-        data[current_year] = {
-            'ministry_allocation': pd.DataFrame({
-                'Ministry': df['Ministry'] if 'Ministry' in df.columns else ['N/A'],
-                'Allocation (in Crores)': df['Allocation'] if 'Allocation' in df.columns else [0]
-            }),
-            
-            'budget_summary': {
-                'Total Budget': df['Total_Budget'].iloc[0] if 'Total_Budget' in df.columns else 0,
-                'Fiscal Deficit': df['Fiscal_Deficit'].iloc[0] if 'Fiscal_Deficit' in df.columns else 0,
-                'Fiscal Deficit %': df['Fiscal_Deficit_Percentage'].iloc[0] if 'Fiscal_Deficit_Percentage' in df.columns else 0,
-                'GDP': df['GDP'].iloc[0] if 'GDP' in df.columns else 0
-            }
+        years = [2024]
+        order = np.arange(len(df))
+        bounds = np.array([0, len(df)])
+    
+    # Each hierarchy level is hashed once; the rest works on its integer codes,
+    # gathered in year order
+    year_codes = np.repeat(np.arange(len(years)), np.diff(bounds))
+    levels = {}
+    for level in HIERARCHY_LEVELS:
+        if level in df.columns:
+            codes, dtype = factorize_labels(df[level], level)
+            levels[level] = (codes[order], dtype)
+        elif level == 'Ministry':
+            levels[level] = (np.zeros(len(order), dtype=np.intp), pd.CategoricalDtype(['N/A']))
+    if 'Allocation' in df.columns:
+        allocations = pd.to_numeric(df['Allocation'], errors='coerce').to_numpy(dtype=float)[order]
+    else:
+        allocations = np.zeros(len(order))
+    
+    # Repeated rows of the same year and ministry (or scheme) are summed, as in stream_csv_data
+    groups, group_starts = repeated_paths(year_codes, [codes for codes, _ in levels.values()], [len(dtype.categories) for _, dtype in levels.values()])
+    if groups is not None:
+        totals = np.bincount(groups, weights=np.nan_to_num(allocations))
+        # A group whose allocations are all missing stays missing
+        totals[np.bincount(groups, weights=~np.isnan(allocations)) == 0] = np.nan
+        allocations = totals
+        year_codes = year_codes[group_starts]
+        levels = {level: (codes[group_starts], dtype) for level, (codes, dtype) in levels.items()}
+    year_bounds = np.searchsorted(year_codes, np.arange(len(years) + 1))
+    
+    ministry_df = pd.DataFrame({
+        **{level: pd.Categorical.from_codes(codes, dtype=dtype) for level, (codes, dtype) in levels.items()},
+        'Allocation (in Crores)': allocations
+    })
+    if len(order):
+        first_rows = summary_df.take(order[bounds[:-1]]).to_dict('records')
+    else:
+        # A header without rows has no first row to read the summary from
+        first_rows = [dict.fromkeys(SUMMARY_COLUMNS, 0) for _ in years]
+    
+    for i, year in enumerate(years):
+        # Create a basic structure for the year's data
+        data[year] = {
+            'ministry_allocation': ministry_df.iloc[year_bounds[i]:year_bounds[i + 1]].reset_index(drop=True),
+            'budget_summary': first_rows[i]
         }
     
     return data
 
-def create_bar_chart(df, x_col, y_col, title, color=None, horizontal=False):
-    """Create a bar chart using Plotly"""
+def repeated_paths(year_codes, level_codes, cardinalities):
+    """
+    Find repeated (year, hierarchy path) rows from their integer codes
+    
+    Returns (group of every row, first row of every group) with groups numbered
+    in order of their first row, or (None, None) if every row is distinct. The
+    codes are packed into one int64 key, so only one integer column is checked
+    for repeats and hashed only if it has any.
+    """
+    key = year_codes.astype(np.int64)
+    if np.prod([float(n + 1) for n in cardinalities]) * (year_codes.max(initial=0) + 1) < 2.0 ** 62:
+        for codes, n in zip(level_codes, cardinalities):
+            key = key * (n + 1) + (codes + 1)
+        # Sorting a copy of the key finds repeats several times faster than hashing it
+        ordered = np.sort(key)
+        if not (ordered[1:] == ordered[:-1]).any():
+            return None, None
+        groups, uniques = pd.factorize(key)
+        group_count = len(uniques)
+    else:
+        # Too many labels to pack into one key
+        groups = pd.DataFrame({'Year': year_codes, **{k: codes for k, codes in enumerate(level_codes)}}).groupby(
+            ['Year', *range(len(level_codes))], sort=False).ngroup().to_numpy()
+        group_count = groups.max(initial=-1) + 1
+    if group_count == len(groups):
+        return None, None
+    
+    # A group starts at its first row, where its number exceeds every earlier one
+    first = np.ones(len(groups), dtype=bool)
+    first[1:] = groups[1:] > np.maximum.accumulate(groups)[:-1]
+    return groups, np.flatnonzero(first)
+
+def sum_allocations(frame, keys):
+    """
+    Sum the allocations of rows sharing the same keys (year and hierarchy path)
+    Groups keep the order of their first row; a group whose allocations are all missing stays missing
+    """
+    return frame.groupby(keys, sort=False, dropna=False, observed=True)['Allocation (in Crores)'].sum(min_count=1).reset_index()
+
+def stream_csv_data(uploaded_file, chunksize=STREAM_CHUNK_ROWS, progress=None):
+    """
+    Stream a CSV upload in chunks into the per-year application structure
+    
+    Each chunk is aggregated straight into per-year ministry totals and budget
+    summaries, and the chunk totals are folded together every
+    STREAM_REDUCE_CHUNKS chunks, so peak memory depends on the chunk size and
+    the number of distinct ministries, not on the file size. Repeated rows for
+    the same ministry and year are summed, as in process_uploaded_data.
+    """
+    size = upload_size(uploaded_file) or 1
+    needed = {'Year', *HIERARCHY_LEVELS, 'Allocation', *SUMMARY_COLUMNS.values()}
+    
+    parts = []
+    keys = None
+    summaries = {}
+    
+    uploaded_file.seek(0)
+    reader = pd.read_csv(uploaded_file, chunksize=chunksize, usecols=lambda column: column in needed)
+    for chunk in reader:
+        if 'Year' not in chunk.columns:
+            # If no year column, assume it's for a single year (current year)
+            chunk['Year'] = 2024
+        chunk = chunk.dropna(subset=['Year'])
+        
+        # This chunk's ministry (or department and scheme) totals
+        levels = ['Ministry', *[level for level in HIERARCHY_LEVELS[1:] if level in chunk.columns]]
+        keys = ['Year', *levels]
+        parts.append(sum_allocations(pd.DataFrame({
+            'Year': chunk['Year'],
+            'Ministry': chunk['Ministry'] if 'Ministry' in chunk.columns else 'N/A',
+            **{level: chunk[level] for level in levels[1:]},
+            'Allocation (in Crores)': chunk['Allocation'] if 'Allocation' in chunk.columns else 0
+        }), keys))
+        # Fold the collected chunk totals together in batches instead of realigning per chunk
+        if len(parts) >= STREAM_REDUCE_CHUNKS:
+            parts = [sum_allocations(pd.concat(parts, ignore_index=True), keys)]
+        
+        # The budget summary comes from the first row seen for each year
+        for row in chunk.drop_duplicates('Year').to_dict('records'):
+            if row['Year'] not in summaries:
+                summaries[row['Year']] = {
+                    key: row.get(column, 0)
+                    for key, column in SUMMARY_COLUMNS.items()
+                }
+        
+        if progress is not None:
+            progress(min(uploaded_file.tell() / size, 1.0))
+    
+    data = {}
+    if not parts:
+        return data
+    
+    allocations = sum_allocations(pd.concat(parts, ignore_index=True), keys)
+    allocations = dict(tuple(allocations.groupby('Year', sort=False)))
+    for year, summary in summaries.items():
+        data[year] = {
+            'ministry_allocation': allocations[year].drop(columns='Year').reset_index(drop=True),
+            'budget_summary': summary
+        }
+    
+    return encode_dimensions(data)
+
+def create_bar_chart(df, x_col, y_col, title, color=None, horizontal=False, top_n=None):
+    """
+    Create a bar chart using Plotly (served from the figure cache when unchanged)
+    Only the top_n largest bars are drawn (default CHART_TOP_N), the rest are folded into "Others"
+    """
+    top_n = CHART_TOP_N if top_n is None else top_n
+    key = ('bar', (data_fingerprint(df, [x_col, y_col, color]),), (x_col, y_col, title, color, horizontal, top_n))
+    return _cached_figure(key, lambda: _build_bar_chart(
+        fold_top_n(df, y_col, x_col, top_n), x_col, y_col, title, color, horizontal
+    ))
+
+def _build_bar_chart(df, x_col, y_col, title, color, horizontal):
+    """Build a bar chart figure with the app's styling"""
     if horizontal:
         fig = px.bar(df, y=x_col, x=y_col, title=title, orientation='h', color=color)
     else:
@@ -204,9 +656,31 @@ def create_bar_chart(df, x_col, y_col, title, color=None, horizontal=False):
     
     return fig
 
-def create_pie_chart(df, values_col, names_col, title):
-    """Create a pie chart using Plotly"""
-    fig = px.pie(df, values=values_col, names=names_col, title=title)
+def create_pie_chart(df, values_col, names_col, title, top_n=None):
+    """
+    Create a pie chart using Plotly (served from the figure cache when unchanged)
+    Only the top_n largest slices are drawn (default CHART_TOP_N), the rest are folded into "Others"
+    """
+    top_n = CHART_TOP_N if top_n is None else top_n
+    key = ('pie', (data_fingerprint(df, [values_col, names_col]),), (values_col, names_col, title, top_n))
+    return _cached_figure(key, lambda: _build_pie_chart(
+        fold_top_n(df, values_col, names_col, top_n), values_col, names_col, title
+    ))
+
+def create_donut_chart(df, values_col, names_col, title, top_n=None):
+    """
+    Create a donut chart using Plotly (served from the figure cache when unchanged)
+    Only the top_n largest slices are drawn (default CHART_TOP_N), the rest are folded into "Others"
+    """
+    top_n = CHART_TOP_N if top_n is None else top_n
+    key = ('donut', (data_fingerprint(df, [values_col, names_col]),), (values_col, names_col, title, top_n))
+    return _cached_figure(key, lambda: _build_pie_chart(
+        fold_top_n(df, values_col, names_col, top_n), values_col, names_col, title, hole=0.4
+    ))
+
+def _build_pie_chart(df, values_col, names_col, title, hole=None):
+    """Build a pie (or, with a hole, donut) chart figure with the app's styling"""
+    fig = px.pie(df, values=values_col, names=names_col, title=title, hole=hole)
     
     fig.update_layout(
         title_font_size=20,
@@ -215,22 +689,107 @@ def create_pie_chart(df, values_col, names_col, title):
     
     return fig
 
-def create_donut_chart(df, values_col, names_col, title):
-    """Create a donut chart using Plotly"""
-    fig = px.pie(df, values=values_col, names=names_col, title=title, hole=0.4)
+def create_drilldown_chart(children, label_col, value_col, root_label, title, kind='treemap', top_n=None):
+    """
+    Create a treemap or sunburst of one node of a hierarchy and its children
+    (served from the figure cache when unchanged)
+    Only the top_n largest children are drawn (default CHART_TOP_N), the rest are folded into "Others"
+    """
+    top_n = CHART_TOP_N if top_n is None else top_n
+    key = ('drilldown', (data_fingerprint(children, [label_col, value_col]),), (label_col, value_col, root_label, title, kind, top_n))
+    return _cached_figure(key, lambda: _build_drilldown_chart(
+        fold_top_n(children, value_col, label_col, top_n), label_col, value_col, root_label, title, kind
+    ))
+
+def _build_drilldown_chart(children, label_col, value_col, root_label, title, kind):
+    """Build a treemap/sunburst figure of a node and its children with the app's styling"""
+    labels = [str(label) for label in children[label_col]]
+    values = children[value_col].to_numpy(dtype=float)
+    trace = go.Sunburst if kind == 'sunburst' else go.Treemap
+    
+    fig = go.Figure(trace(
+        ids=['root'] + [f"root/{label}" for label in labels],
+        labels=[root_label] + labels,
+        parents=[''] + ['root'] * len(labels),
+        values=np.concatenate(([values.sum()], values)),
+        branchvalues='total'
+    ))
     
     fig.update_layout(
+        title=title,
         title_font_size=20,
-        legend_title_font_size=16
+        height=500
     )
     
     return fig
 
-def create_line_chart(x, y, title, labels=None):
-    """Create a line chart using Plotly"""
+def fold_top_n(df, values_col, names_col, top_n, other_label=CHART_OTHERS_LABEL):
+    """
+    Sum the rows of each name, keep the top_n names with the largest values and fold
+    the rest into one "Others" row
+    
+    The top names are chosen with a partial selection (np.argpartition), not a full
+    sort; only they are ordered, largest first, and "Others" comes last. Numeric
+    columns are summed per name and over the folded names; other columns keep a
+    name's first value and hold the label in the "Others" row. An "Others" row
+    already in df is never a top row: the folded rows are added into it.
+    """
+    if not top_n:
+        return df
+    
+    # Rows sharing a name are one bar or slice
+    if df[names_col].duplicated().any():
+        grouped = df.groupby(names_col, sort=False, observed=True, dropna=False)
+        numeric = [column for column in df.columns if column != names_col and pd.api.types.is_numeric_dtype(df[column])]
+        other = [column for column in df.columns if column != names_col and column not in numeric]
+        df = pd.concat(
+            [grouped[numeric].sum(min_count=1), grouped[other].first()], axis=1
+        ).reset_index()[list(df.columns)]
+    
+    values = pd.to_numeric(df[values_col], errors='coerce').to_numpy(dtype=float)
+    # Missing values are never among the top rows
+    keys = np.where(np.isnan(values), np.inf, -values)
+    existing = df[names_col].isin([other_label]).to_numpy()
+    candidates = np.flatnonzero(~existing)
+    if len(candidates) > top_n:
+        top = candidates[np.argpartition(keys[candidates], top_n - 1)[:top_n]]
+    else:
+        top = candidates
+    # Largest first; ties keep their input order
+    top = top[np.lexsort((top, keys[top]))]
+    if len(candidates) <= top_n:
+        # Nothing to fold; an existing "Others" row stays last
+        return df.iloc[np.append(top, np.flatnonzero(existing))].reset_index(drop=True)
+    
+    keep = np.zeros(len(df), dtype=bool)
+    keep[top] = True
+    folded = df.iloc[~keep]
+    others = {}
+    for column in df.columns:
+        if column != names_col and pd.api.types.is_numeric_dtype(df[column]):
+            others[column] = folded[column].sum()
+        else:
+            others[column] = other_label
+    
+    return pd.concat([df.iloc[top], pd.DataFrame([others])], ignore_index=True)
+
+def create_line_chart(x, y, title, labels=None, max_points=None):
+    """
+    Create a line chart using Plotly (served from the figure cache when unchanged)
+    Series longer than max_points (default LINE_MAX_POINTS) are downsampled with
+    LTTB and drawn with WebGL; 0 disables the high-volume mode
+    """
     if labels is None:
         labels = {"x": "X", "y": "Y"}
+    max_points = LINE_MAX_POINTS if max_points is None else max_points
     
+    key = ('line', (data_fingerprint(x), data_fingerprint(y)), (title, tuple(sorted(labels.items())), max_points))
+    if max_points and len(y) > max_points:
+        return _cached_figure(key, lambda: _build_webgl_line_chart(x, y, title, labels, max_points))
+    return _cached_figure(key, lambda: _build_line_chart(x, y, title, labels))
+
+def _build_line_chart(x, y, title, labels):
+    """Build a line chart figure with the app's styling"""
     fig = px.line(x=x, y=y, markers=True, 
                  labels=labels, title=title)
     
@@ -242,43 +801,195 @@ def create_line_chart(x, y, title, labels=None):
     
     return fig
 
+def _build_webgl_line_chart(x, y, title, labels, max_points):
+    """Build a downsampled WebGL line chart with the same styling as _build_line_chart"""
+    x = pd.Series(np.asarray(x)).reset_index(drop=True)
+    y = pd.to_numeric(pd.Series(np.asarray(y)), errors='coerce').reset_index(drop=True)
+    present = y.notna().to_numpy()
+    x, y = x[present], y[present]
+    
+    # LTTB needs numeric positions; dates use their timestamps, anything else its order
+    if pd.api.types.is_datetime64_any_dtype(x):
+        positions = x.to_numpy().astype('datetime64[ns]').astype(np.int64).astype(float)
+    elif pd.api.types.is_numeric_dtype(x):
+        positions = x.to_numpy(dtype=float)
+    else:
+        positions = np.arange(len(x), dtype=float)
+    
+    keep = lttb_indices(positions, y.to_numpy(dtype=float), max_points)
+    
+    fig = go.Figure(go.Scattergl(x=x.to_numpy()[keep], y=y.to_numpy()[keep], mode='lines'))
+    fig.update_layout(
+        title=title,
+        xaxis_title=labels.get('x'),
+        yaxis_title=labels.get('y'),
+        title_font_size=20,
+        xaxis_title_font_size=16,
+        yaxis_title_font_size=16
+    )
+    
+    return fig
+
+def lttb_indices(x, y, threshold):
+    """
+    Return the indices of the points kept by Largest-Triangle-Three-Buckets downsampling
+    
+    x must be ascending. The first and last points are always kept; every bucket in
+    between contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket, which preserves peaks and dips.
+    """
+    length = len(y)
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+    
+    # Bucket boundaries over the interior points
+    edges = np.linspace(1, length - 1, threshold - 1).astype(np.int64)
+    # Average point of each bucket, used as the third triangle vertex
+    sums_x = np.add.reduceat(x[1:length - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:length - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+    
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = length - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Twice the triangle area for every candidate in the bucket
+        area = np.abs(
+            (x[previous] - avg_x[i + 1]) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y[i + 1] - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        keep[i + 1] = previous
+    
+    return keep
+
+def data_fingerprint(data, columns=None):
+    """
+    Return a content hash of chart input data (DataFrame, Series, array or list)
+    For a DataFrame only the given columns are hashed (default: all), so columns
+    the chart never reads cost nothing; None entries (e.g. no color column) are skipped.
+    Returns None when the data cannot be hashed, which disables caching for that call
+    """
+    try:
+        if isinstance(data, pd.DataFrame):
+            if columns is not None:
+                data = data[list(dict.fromkeys(column for column in columns if column is not None))]
+            hashed = pd.util.hash_pandas_object(data, index=False)
+            header = repr([(column, str(dtype)) for column, dtype in data.dtypes.items()])
+        else:
+            series = data if isinstance(data, pd.Series) else pd.Series(np.asarray(data))
+            hashed = pd.util.hash_pandas_object(series, index=False)
+            header = repr((series.name, str(series.dtype)))
+    except (KeyError, TypeError, ValueError):
+        return None
+    
+    digest = hashlib.blake2b(header.encode(), digest_size=16)
+    digest.update(hashed.to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _cached_figure(key, build):
+    """
+    Return the figure cached under key, or build it and cache its JSON
+    key is (chart kind, data fingerprints, chart parameters)
+    """
+    if None in key[1]:
+        return build()
+    
+    with _figure_cache_lock:
+        figure_json = _figure_cache.get(key)
+        if figure_json is not None:
+            _figure_cache.move_to_end(key)
+    
+    if figure_json is None:
+        fig = build()
+        with _figure_cache_lock:
+            _figure_cache[key] = fig.to_json()
+            while len(_figure_cache) > FIGURE_CACHE_SIZE:
+                _figure_cache.popitem(last=False)
+        return fig
+    
+    # The JSON came from an already validated figure, so validation is skipped
+    return go.Figure(json.loads(figure_json), _validate=False)
+
+def clear_figure_cache():
+    """Drop every cached figure"""
+    with _figure_cache_lock:
+        _figure_cache.clear()
+
 def format_currency(amount, currency="₹"):
-    """Format amount as currency with appropriate abbreviations for large numbers"""
-    if amount >= 1e7:  # 10,000,000 (10 million or 1 crore)
+    """Format amount as currency with appropriate abbreviations for large numbers (of either sign)"""
+    if abs(amount) >= 1e7:  # 10,000,000 (10 million or 1 crore)
         return f"{currency} {amount/1e7:.2f} Cr"
-    elif amount >= 1e5:  # 100,000 (1 lakh)
+    elif abs(amount) >= 1e5:  # 100,000 (1 lakh)
         return f"{currency} {amount/1e5:.2f} L"
     else:
         return f"{currency} {amount:,.2f}"
 
-def generate_insights(data, year):
-    """Generate insights based on the data for a specific year"""
-    insights = []
+def format_currency_array(amounts, currency="₹"):
+    """
+    Vectorized format_currency: format a whole column or array in one pass
+    Returns a NumPy array of strings identical to format_currency applied per value
+    """
+    values = np.asarray(amounts, dtype=float).ravel()
     
-    try:
-        year_data = data[year]
-        
-        # Budget allocation insights
-        ministry_df = year_data['ministry_allocation']
-        top_ministry = ministry_df.loc[ministry_df['Allocation (in Crores)'].idxmax()]
-        insights.append(f"The {top_ministry['Ministry']} ministry has the highest allocation at {format_currency(top_ministry['Allocation (in Crores)'] * 1e7)}.")
-        
-        # Budget summary insights
-        summary = year_data['budget_summary']
-        insights.append(f"The total budget for {year} is {format_currency(summary['Total Budget'] * 1e7)}.")
-        insights.append(f"The fiscal deficit is {summary['Fiscal Deficit %']}% of GDP.")
-        
-        # Spending type insights
-        if 'spending_type' in year_data:
-            spending_df = year_data['spending_type']
-            capital_exp = spending_df.loc[spending_df['Type'] == 'Capital Expenditure', 'Amount (in Crores)'].iloc[0]
-            revenue_exp = spending_df.loc[spending_df['Type'] == 'Revenue Expenditure', 'Amount (in Crores)'].iloc[0]
-            total_exp = capital_exp + revenue_exp
-            
-            insights.append(f"Capital expenditure accounts for {(capital_exp/total_exp)*100:.1f}% of total expenditure.")
-            insights.append(f"Revenue expenditure accounts for {(revenue_exp/total_exp)*100:.1f}% of total expenditure.")
+    # Bucket every value into Cr / L / plain at once, by magnitude so losses abbreviate too
+    magnitude = np.abs(values)
+    crore = magnitude >= 1e7
+    lakh = (magnitude >= 1e5) & ~crore
+    plain = ~(crore | lakh)
+    scaled = np.where(crore, values / 1e7, np.where(lakh, values / 1e5, values))
     
-    except Exception as e:
-        insights.append(f"Could not generate insights due to data structure issues: {e}")
+    # '%.2f' rounds like format_currency's '{:.2f}'; only the plain bucket gets
+    # thousands separators, and at most one since it is below 1e5
+    numbers = np.char.mod('%.2f', scaled)
+    grouped = _group_thousands(numbers[plain])
+    # The commas can make the plain strings the longest
+    numbers = numbers.astype(np.result_type(numbers.dtype, grouped.dtype))
+    numbers[plain] = grouped
     
-    return insights 
\ No newline at end of file
+    suffix = np.where(crore, ' Cr', np.where(lakh, ' L', ''))
+    return np.char.add(np.char.add(f"{currency} ", numbers), suffix)
+
+def _group_thousands(strings):
+    """Insert the thousands comma into '%.2f' strings of values below 1e6 in magnitude"""
+    if not len(strings):
+        return strings
+    # Right-aligned in 10 characters, the thousands digit (if any) is the 4th character
+    chars = np.char.rjust(strings, 10).view('U1').reshape(len(strings), 10)
+    head = np.ascontiguousarray(chars[:, :4]).view('U4').ravel()
+    tail = np.ascontiguousarray(chars[:, 4:]).view('U6').ravel()
+    comma = np.where(np.char.isdigit(chars[:, 3]), ',', '')
+    return np.char.lstrip(np.char.add(np.char.add(head, comma), tail), ' ')
+
+def format_table(df, currency_columns=(), percent_columns=(), scale=1e7):
+    """
+    Return a Styler of df with currency and percent columns formatted for display
+    Each column's display strings are built in one vectorized pass instead of a per-cell
+    formatting callback; the cells keep their numeric values, so sorting a column in
+    st.dataframe stays numeric. Currency values are multiplied by scale first (1e7
+    converts crores to rupees)
+    """
+    styler = df.style
+    for column in currency_columns:
+        values = df[column].to_numpy(dtype=float)
+        styler = styler.format(
+            _display_lookup(values, format_currency_array(values * scale)),
+            subset=[column],
+            na_rep=format_currency(np.nan)
+        )
+    for column in percent_columns:
+        values = df[column].to_numpy(dtype=float)
+        styler = styler.format(
+            _display_lookup(values, np.char.mod('%.2f%%', values)),
+            subset=[column],
+            na_rep='nan%'
+        )
+    return styler
+
+def _display_lookup(values, strings):
+    """Return a formatter that looks up the precomputed display string of a cell value"""
+    return dict(zip(values.tolist(), strings.tolist())).get
@@ -0,0 +1,124 @@
+import streamlit as st
+import sys
+import os
+
+# Add parent directory to path to import utils.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from layout import show_sections
+from utils import format_table
+from figures import summary_trend_figures, category_trend_figure, movers_figure
+from comparison import compare_window
+
+# Currency-valued summary metrics (the others are percentages)
+CURRENCY_METRICS = ['Total Budget', 'Fiscal Deficit', 'Revenue Deficit', 'GDP']
+
+def show(data):
+    """Display the N-year comparison view of budget data for any window of years"""
+    # Page header
+    st.markdown('<div class="main-header">Multi-Year Comparison</div>', unsafe_allow_html=True)
+
+    if data is None:
+        st.error("No data available. Please upload a file or use sample data.")
+        return
+
+    if len(data.years) < 2:
+        st.warning("Data for at least 2 years is required for this view. Currently only data for 1 year is available.")
+        return
+
+    # Pick any year range; every figure below comes from the same engine window
+    chronological = list(data.years[::-1])
+    start_year, end_year = st.select_slider(
+        "Select a Year Range",
+        options=chronological,
+        value=(chronological[0], chronological[-1])
+    )
+    selected_years = [year for year in chronological if start_year <= year <= end_year]
+    if len(selected_years) < 2:
+        st.warning("Select a range covering at least 2 years.")
+        return
+
+    window = compare_window(data, selected_years)
+
+    # Display selected years in the header
+    st.markdown(f'<div class="sub-header">Budget Comparison: {start_year} - {end_year} ({len(selected_years)} years)</div>', unsafe_allow_html=True)
+
+    # Tab 1: Budget Summary
+    def budget_summary():
+        st.markdown('<div class="section-header">Budget Summary Across the Window</div>', unsafe_allow_html=True)
+
+        summary_df = window.summary.reset_index()
+
+        st.dataframe(
+            format_table(
+                summary_df,
+                currency_columns=[metric for metric in window.summary.columns if metric in CURRENCY_METRICS],
+                percent_columns=[metric for metric in window.summary.columns if metric not in CURRENCY_METRICS]
+            ),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        # Growth and CAGR for every metric
+        st.markdown('<div class="section-header">Overall Growth</div>', unsafe_allow_html=True)
+
+        st.dataframe(
+            window.summary_growth.style.format({
+                str(start_year): '{:,.2f}',
+                str(end_year): '{:,.2f}',
+                'Change (%)': '{:.2f}%',
+                'CAGR (%)': '{:.2f}%'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        # Trend lines for every metric
+        col1, col2 = st.columns(2)
+        for i, (_, fig) in enumerate(summary_trend_figures(window.summary)):
+            with (col1 if i % 2 == 0 else col2):
+                st.plotly_chart(fig, use_container_width=True)
+
+    # Tabs 2-5: one comparison per category
+    def category_section(category, title):
+        def render():
+            st.markdown(f'<div class="section-header">{title}: {start_year} - {end_year}</div>', unsafe_allow_html=True)
+
+            if not data.has_table(category, selected_years):
+                st.info(f"{title} data not available for all selected years.")
+                return
+
+            show_category(window, category, title)
+        return render
+
+    # Render only the selected section (see layout.LAZY_SECTIONS)
+    show_sections([
+        ("Budget Summary", budget_summary),
+        ("Ministry Allocations", category_section('ministry_allocation', "Ministry-wise Budget Allocation")),
+        ("Sector-wise Expenditure", category_section('sector_expenditure', "Sector-wise Expenditure")),
+        ("Revenue Sources", category_section('revenue_sources', "Revenue Sources")),
+        ("Capital vs Revenue", category_section('spending_type', "Capital vs Revenue Expenditure"))
+    ], key='year_window_section')
+
+def show_category(window, category, title):
+    """Display the comparison table and trend chart of one category over the window"""
+    pivot = window.pivots[category]
+
+    # Comparison table: every year of the window plus change and CAGR
+    table = pivot.rename(columns={year: str(year) for year in window.years})
+    st.dataframe(
+        format_table(
+            table,
+            currency_columns=[str(year) for year in window.years],
+            percent_columns=['Change (%)', 'CAGR (%)']
+        ),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    # Trend chart of the largest entities in the latest year
+    st.plotly_chart(category_trend_figure(window, category), use_container_width=True)
+
+    # Biggest movers by CAGR
+    st.markdown('<div class="section-header">Fastest Growing (CAGR)</div>', unsafe_allow_html=True)
+
+    st.plotly_chart(movers_figure(window, category), use_container_width=True)